@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 from pathlib import Path
 
+from vault_walker import walk_vault
+
 vault = Path.cwd()
-md_files = list(vault.rglob('*.md'))
+md_files = list(walk_vault(vault))
 print(f"Total markdown files: {len(md_files)}")
 
 # Count by directory
 dirs = {}
 for f in md_files:
-    parent = f.parent.name
+    parent = f.path.parent.name
     dirs[parent] = dirs.get(parent, 0) + 1
 
 print("\nBy directory:")
@@ -40,15 +40,15 @@ def test_environment():
 
 def test_file_scanning():
     """Test scanning for markdown files."""
-    from pathlib import Path
+    from vault_walker import walk_vault
     vault_path = Path.cwd()
-    md_files = list(vault_path.rglob('*.md'))
+    md_files = list(walk_vault(vault_path))
     print(f"Found {len(md_files)} markdown files in vault")
     
     # Show some examples
     print("\nSample files:")
     for f in md_files[:5]:
-        print(f"  - {f.relative_to(vault_path)}")
+        print(f"  - {f.relative}")
     
     return len(md_files) > 0
 
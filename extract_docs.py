@@ -8,12 +8,26 @@ import re
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from keyword_matcher import compile_matcher
+from markdown_tokenizer import MARKDOWN_LINK, protected_spans
+from parse_cache import ParseCache
+
+# Content keyword -> tag added to the frontmatter, in tag order
+TAG_KEYWORDS = {
+    'multi-agent': 'multi-agent',
+    'single-agent': 'single-agent',
+    'context': 'context-management',
+    'cognition.ai': 'cognition-ai',
+}
 
 class ObsidianDocExtractor:
-    def __init__(self, source_base: str, target_base: str):
+    def __init__(self, source_base: str, target_base: str, parse_cache_path: Optional[str] = None):
         self.source_base = Path(source_base)
         self.target_base = Path(target_base)
+        # The same cache generate_links keeps for the vault, so re-extracting unchanged docs skips parsing
+        self.parse_cache = ParseCache(parse_cache_path or self.target_base / '.link-cache' / 'parse-cache.bin')
         self.project_mappings = {
             'claude-ultrathink': 'Claude-UltraThink',
             'claude-am': 'Claude-AM',
@@ -118,9 +132,11 @@ class ObsidianDocExtractor:
         with open(source_path, 'r', encoding='utf-8') as f:
             content = f.read()
             
-        # Convert links and add frontmatter
-        processed_content = self._add_frontmatter(content, source_path, project, file_type)
-        processed_content = self._convert_links(processed_content, project)
+        # Convert links and add frontmatter; the frontmatter is left alone by the
+        # conversion, so only the source text is converted and its tokens stay cacheable
+        with_frontmatter = self._add_frontmatter(content, source_path, project, file_type)
+        frontmatter = with_frontmatter[:len(with_frontmatter) - len(content)]
+        processed_content = frontmatter + self._convert_links(content, project)
         
         with open(target_path, 'w', encoding='utf-8') as f:
             f.write(processed_content)
@@ -165,7 +181,7 @@ class ObsidianDocExtractor:
     def _add_frontmatter(self, content: str, source_path: Path, project: str, file_type: str = 'documentation') -> str:
         """Add YAML frontmatter to content."""
         # Skip if already has frontmatter
-        if content.startswith('---\n'):
+        if content.startswith(('---\n', '---\r\n')):
             return content
             
         # Extract title from content or filename
@@ -174,14 +190,8 @@ class ObsidianDocExtractor:
         
         # Determine tags based on content
         tags = [project.lower().replace('-', '_')]
-        if 'multi-agent' in content.lower():
-            tags.append('multi-agent')
-        if 'single-agent' in content.lower():
-            tags.append('single-agent')
-        if 'context' in content.lower():
-            tags.append('context-management')
-        if 'cognition.ai' in content.lower():
-            tags.append('cognition-ai')
+        found = compile_matcher(TAG_KEYWORDS).find_keywords(content)
+        tags.extend(tag for keyword, tag in TAG_KEYWORDS.items() if keyword in found)
         if file_type != 'documentation':
             tags.append(file_type)
             
@@ -199,15 +209,18 @@ source: {source_path.name}
         return frontmatter + content
         
     def _convert_links(self, content: str, project: str) -> str:
-        """Convert internal links to Obsidian wiki links."""
-        # Convert markdown links to wiki links
-        def replace_link(match):
-            text = match.group(1)
-            link = match.group(2)
+        """Convert internal links to Obsidian wiki links.
+
+        Works from the markdown token stream, so links and text inside
+        code, frontmatter and existing links are left untouched.
+        """
+        def replace_link(token):
+            text = token.label
+            link = token.target
             
             # Skip external links
             if link.startswith(('http://', 'https://', 'ftp://')):
-                return match.group(0)
+                return content[token.start:token.end]
                 
             # Convert relative links to wiki links
             if link.endswith('.md'):
@@ -216,16 +229,26 @@ source: {source_path.name}
             else:
                 return f"[[{text}]]"
                 
-        content = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', replace_link, content)
-        
-        # Add cross-project references where appropriate
-        if project == 'Claude-UltraThink':
-            # Add links to CAM and Contexify concepts
-            content = re.sub(r'\b(multi-agent)\b', r'[[Multi-Agent-Orchestration|\1]]', content, flags=re.IGNORECASE)
-            content = re.sub(r'\b(CAM)\b', r'[[Claude-AM|\1]]', content)
-            content = re.sub(r'\b(context window)\b', r'[[Context-Window-Reality|\1]]', content, flags=re.IGNORECASE)
+        def add_references(text):
+            # Add cross-project references where appropriate
+            if project == 'Claude-UltraThink':
+                # Add links to CAM and Contexify concepts
+                text = re.sub(r'\b(multi-agent)\b', r'[[Multi-Agent-Orchestration|\1]]', text, flags=re.IGNORECASE)
+                text = re.sub(r'\b(CAM)\b', r'[[Claude-AM|\1]]', text)
+                text = re.sub(r'\b(context window)\b', r'[[Context-Window-Reality|\1]]', text, flags=re.IGNORECASE)
+            return text
             
-        return content
+        pieces = []
+        position = 0
+        for token in protected_spans(self.parse_cache.tokens(content)):
+            pieces.append(add_references(content[position:token.start]))
+            if token.kind == MARKDOWN_LINK:
+                pieces.append(replace_link(token))
+            else:
+                pieces.append(content[token.start:token.end])
+            position = token.end
+        pieces.append(add_references(content[position:]))
+        return ''.join(pieces)
         
     def create_overview_notes(self):
         """Create high-level overview notes for each project."""
@@ -284,10 +307,12 @@ Based on [[Cognition-AI-Research]] showing that current multi-agent systems crea
     def run(self):
         """Run the complete extraction process."""
         print("🚀 Starting documentation extraction...")
+        self.parse_cache.load()
         self.extract_ultrathink()
         self.extract_cam()
         self.extract_contexify()
         self.create_overview_notes()
+        self.parse_cache.save()
         print("✨ Documentation extraction complete!")
 
 
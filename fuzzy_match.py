@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Fuzzy lookup of note names for repairing broken wiki links.
+
+Names are indexed by their character trigrams. A lookup only visits the
+postings of the query's own trigrams, so its cost depends on how many
+names share a trigram with the query rather than on the vault size.
+Candidates are ranked by the Dice coefficient of the two trigram sets.
+"""
+
+import heapq
+import re
+from typing import Dict, List, Sequence, Set, Tuple
+
+SEPARATOR_PATTERN = re.compile(r'[\s_\-]+')
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold a name and treat spaces, dashes and underscores alike."""
+    return SEPARATOR_PATTERN.sub(' ', name.casefold()).strip()
+
+
+def trigrams(name: str) -> Set[str]:
+    """Return the padded character trigrams of a normalized name."""
+    padded = f"  {normalize_name(name)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index from trigram to the IDs of the names containing it."""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = list(names)
+        self.sizes = []
+        self.postings: Dict[str, List[int]] = {}
+        for name_id, name in enumerate(self.names):
+            grams = trigrams(name)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(name_id)
+
+    def closest(self, query: str, k: int = 3, min_similarity: float = 0.4) -> List[Tuple[str, float]]:
+        """Return up to k (name, similarity) pairs scoring at least min_similarity, best first."""
+        grams = trigrams(query)
+        shared = {}
+        for gram in grams:
+            for name_id in self.postings.get(gram, ()):
+                shared[name_id] = shared.get(name_id, 0) + 1
+
+        scored = (
+            (2.0 * count / (len(grams) + self.sizes[name_id]), name_id)
+            for name_id, count in shared.items()
+        )
+        best = heapq.nlargest(k, scored, key=lambda item: (item[0], -item[1]))
+        return [(self.names[name_id], score) for score, name_id in best if score >= min_similarity]
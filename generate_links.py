@@ -11,21 +11,96 @@ This script follows UltraThink's linear processing methodology:
 6. Create comprehensive report
 """
 
+import heapq
+import math
 import os
-import re
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from collections import defaultdict, Counter
 from datetime import datetime
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fuzzy_match import TrigramIndex
+from graph_ranking import core_numbers, hits, pagerank, personalized_pagerank
+from graph_structure import (block_connectivity, bridges_and_articulation_points, group_labels,
+                             label_propagation, strongly_connected_components,
+                             weakly_connected_components)
+from keyword_matcher import KeywordMatcher, compile_matcher, concept_keywords
+from link_graph import INDEX_TYPECODE, LinkGraph
+from link_resolver import LinkResolver, normalize_key
+from link_prediction import adamic_adar, bibliographic_coupling, cocitation
+from note_analyzers import (AnalyzerPass, DuplicateAnalyzer, NoteAnalyzer, TagAnalyzer,
+                            default_analyzers, streaming_analyzers)
+from note_model import Note
+from parse_cache import DEFAULT_MAX_BYTES, TOKENS_FIELD, ParseCache, content_key, encode_tokens
+from markdown_tokenizer import EMBED, WIKI_LINK, Token, protected_spans, tokenize as tokenize_markdown
+from scan_manifest import ScanManifest
+from section_index import SectionIndex
+from sharded_extract import PartialFeatures, add_note_links, extract_features
+from text_similarity import (TermCounts, TfidfMatrix, content_digest, near_duplicate_pairs, near_duplicate_signatures,
+                             terms, word_shingles)
+from vault_walker import VaultEntry, walk_vault
+
+# Reports written into the vault by this script (and their hand-kept copies); scanning them
+# would feed every concept and note name of the last run back in as links and mentions
+GENERATED_NOTES = ('link-analysis-report*.md', 'quick-link-fixes*.md')
+
+# Weights for combining suggestion signals into one score
+SUGGESTION_WEIGHTS = {
+    'concept': 1.0,  # per shared key concept
+    'mention': 3.0,  # unlinked mentions, scaled by log2(1 + count)
+    'similarity': 4.0,  # TF-IDF cosine similarity
+    'cocitation': 0.5,  # per note linking to both
+    'coupling': 0.5,  # per note both link to
+    'adamic_adar': 1.0,  # common neighbours weighted by 1 / log(degree)
+}
 
 class ObsidianLinkGenerator:
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, incremental: bool = True, manifest_path: Optional[str] = None,
+                 workers: int = 1, similarity_top_k: int = 5, suggestions_per_note: int = 10,
+                 processes: int = 1, streaming: bool = False, parse_cache_path: Optional[str] = None,
+                 parse_cache_bytes: int = DEFAULT_MAX_BYTES, exclude: Iterable[str] = GENERATED_NOTES):
         self.vault_path = Path(vault_path)
-        self.notes = {}  # filename -> content
-        self.links = defaultdict(set)  # note -> set of linked notes
-        self.backlinks = defaultdict(set)  # note -> set of notes linking to it
-        self.potential_links = defaultdict(list)  # note -> list of (target, reason)
+        self.exclude = list(exclude)  # globs of vault paths left out of the scan
+        self.incremental = incremental
+        self.workers = workers  # >1 loads files on a bounded thread pool
+        self.processes = processes  # >1 shards link, concept and mention extraction across processes
+        self.streaming = streaming  # analyze each note as it is read, then drop its text
+        self.similarity_top_k = similarity_top_k  # TF-IDF neighbours per note, 0 disables
+        self.suggestions_per_note = suggestions_per_note  # heap bound per note
+        self.manifest_path = Path(manifest_path) if manifest_path else self.vault_path / '.link-cache' / 'scan-manifest.json'
+        parse_cache_path = parse_cache_path or self.vault_path / '.link-cache' / 'parse-cache.bin'
+        # Tokens and per-note features by content hash, shared with extract_docs
+        self.parse_cache = ParseCache(parse_cache_path, parse_cache_bytes) if incremental else None
+        self.notes = {}  # note name (file name, or path when names collide) -> Note
+        self.note_by_id = []  # note ID -> Note
+        self.graph = None  # LinkGraph over note IDs plus unresolved link targets
+        self.note_graph = None  # the same graph restricted to notes that exist
+        self.graph_names = []  # graph node ID -> note or link target name
+        self.node_ids = {}  # note name or normalized unresolved target -> graph node ID
+        self.resolver = None  # LinkResolver from link text to note IDs
+        self.rankings = {}  # note -> PageRank, HITS and k-core scores
+        self.structure = {}  # components, bridges and articulation notes
+        self.near_duplicates = None  # (note, note, similarity) pairs once detected
+        self.communities = []  # label-propagation communities, largest first
+        self.folder_links = {}  # folder block matrix and its weakest pairs
+        self.unresolved_links = {}  # broken link target -> linking notes and repair candidates
+        self.broken_anchors = []  # (source, target note, anchor) for #heading / #^block links that miss
+        self.link_sections = {}  # (source, target) -> heading a suggested link should point at
+        self.potential_links = defaultdict(list)  # note -> list of (target, reason, score), best first
         self.orphaned_notes = set()
+        self.concept_index = {}  # lowercased keyword -> set of notes containing it
+        self.mention_hits = None  # note ID -> (start, end, variation, text) from the analyzer pass or shards
+        self.tag_index = {}  # lowercased inline #tag -> notes using it
+        self.analyzers = []  # custom NoteAnalyzers run alongside the built-in ones
+        self.mention_matcher = None  # matcher over all note name variations
+        self.mention_targets = {}  # lowercased variation -> notes it names
+        self.tfidf = None  # TfidfMatrix with one row per note ID
+        self.link_predictions = {}  # measure -> PairScores over note IDs
+        self._related_cache = {}  # source note ID -> (note IDs read, ranked related notes)
+        self._scan_tokens = {}  # note ID -> tokens parsed by scan_vault, until analyze_notes uses them
         
         # Key concepts to track for auto-linking
         self.key_concepts = {
@@ -61,109 +136,779 @@ class ObsidianLinkGenerator:
         }
         
     def scan_vault(self):
-        """Scan the vault for all markdown files."""
+        """Scan the vault for all markdown files.
+
+        With ``incremental`` enabled, unchanged files are loaded from the scan
+        manifest instead of being re-read and re-parsed. With ``workers`` > 1,
+        file reads and decoding overlap on a thread pool; notes are still
+        added in walk order so ``self.notes`` stays deterministic. Files that
+        do need parsing take their tokens from the parse cache when the same
+        text was parsed before, by this or another tool.
+
+        With ``streaming`` enabled, files are read one at a time, every
+        analyzer runs on the note straight away and its text is dropped, so
+        peak memory follows the size of the extracted features rather than
+        the vault. The manifest, which caches note text, is not used then,
+        and note aliases are not matched as unlinked mentions.
+        """
         print("📂 Scanning vault for markdown files...")
         
-        for md_file in self.vault_path.rglob('*.md'):
-            # Skip hidden directories
-            if any(part.startswith('.') for part in md_file.parts):
-                continue
-                
-            relative_path = md_file.relative_to(self.vault_path)
-            note_name = md_file.stem
+        manifest = ScanManifest(self.manifest_path) if self.incremental and not self.streaming else None
+        if manifest:
+            manifest.load()
+        if self.parse_cache is not None and not self.parse_cache.loaded:
+            self.parse_cache.load()
+            
+        # Hidden directories (.git, .obsidian) are pruned by the walker
+        entries = list(walk_vault(self.vault_path, exclude=self.exclude))
+        # Notes sharing a file name are told apart by their path
+        stem_counts = Counter(entry.stem.casefold() for entry in entries)
+        names = [
+            entry.stem if stem_counts[entry.stem.casefold()] == 1 else entry.relative[:-len('.md')]
+            for entry in entries
+        ]
+        
+        def load(entry):
+            return self._load_note(entry, manifest)
+            
+        analyzer_pass = None
+        if self.streaming:
+            # Names are known from the walk, so mentions can be matched before any note is read
+            self.build_mention_matcher([(name, entry.stem, []) for name, entry in zip(names, entries)])
+            analyzer_pass = AnalyzerPass(streaming_analyzers() + self.analyzers, self.parse_cache)
+            analyzer_pass.begin(self)
+            results = map(load, entries)
+        elif self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                # map() yields results in submission order
+                results = list(pool.map(load, entries))
+        else:
+            results = map(load, entries)
             
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+        counts = Counter()
+        seen = []
+        for name, entry, (parsed, status, record) in zip(names, entries, results):
+            tokens = parsed.pop('tokens', None)  # absent for notes loaded from the manifest
+            key = entry.relative
+            seen.append(key)
+            counts[status] += 1
+            
+            # Manifest updates stay on the calling thread
+            if status == 'reparsed':
+                manifest.record(key, *record, parsed)
+            elif status == 'touched':
+                manifest.touch(key, *record[:2])
                 
-            self.notes[note_name] = {
-                'path': relative_path,
-                'content': content,
-                'file': md_file
-            }
+            note = self._add_note(name, entry.relative, parsed)
+            if analyzer_pass:
+                analyzer_pass.process(note, tokens)
+                note.release_content()
+            elif tokens is not None:
+                self._scan_tokens[note.id] = tokens
+            
+        if manifest:
+            removed = manifest.prune(seen)
+            manifest.save()
+            reused = counts['cached'] + counts['touched']
+            print(f"  ♻️  Reused {reused}, re-parsed {counts['reparsed']}, dropped {len(removed)} cached notes")
             
         print(f"  ✅ Found {len(self.notes)} markdown files")
+        if analyzer_pass:
+            analyzer_pass.finish(self)
+        self._save_parse_cache()
+        
+    def _save_parse_cache(self):
+        """Report parse cache use since the last save and write new entries to disk."""
+        if self.parse_cache is None:
+            return
+        cache = self.parse_cache
+        if cache.hits or cache.misses:
+            print(f"  ♻️  Parse cache: {cache.hits} hits, {cache.misses} misses, {len(cache)} notes cached")
+            cache.hits = cache.misses = 0
+        cache.save()
+        
+    def _add_note(self, note_name: str, relative: str, parsed: Dict) -> Note:
+        """Create the Note for a parse result, reusing the ID of a same-named note."""
+        existing = self.notes.get(note_name)
+        note_id = existing.id if existing else len(self.note_by_id)
+        note = Note(note_id, note_name, relative, parsed['content'], parsed['links'], parsed['embeds'],
+                    SectionIndex.from_dict(parsed['sections']))
+        
+        self.notes[note.name] = note
+        if existing:
+            self.note_by_id[note_id] = note
+        else:
+            self.note_by_id.append(note)
+        return note
+        
+    def _load_note(self, entry: VaultEntry, manifest: Optional[ScanManifest]) -> Tuple[Dict, str, Tuple]:
+        """Read and parse one file, consulting the manifest when given.
+
+        Safe to call from worker threads: the manifest is only read here and
+        the parse cache locks its own updates.
+        Returns (parsed, status, record) where status is one of 'cached',
+        'touched', 'reparsed' or 'read' and record holds the
+        (mtime_ns, size, hash) to store for changed files.
+        """
+        if manifest is None:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                return self._parse_note(f.read()), 'read', ()
+                
+        cached = manifest.lookup(entry.relative, entry.mtime_ns, entry.size)
+        if cached is not None:
+            return cached, 'cached', ()
+            
+        with open(entry.path, 'rb') as f:
+            raw = f.read()
+        digest = manifest.content_hash(raw)
+        record = (entry.mtime_ns, entry.size, digest)
+        
+        cached = manifest.lookup_hash(entry.relative, digest)
+        if cached is not None:
+            return cached, 'touched', record
+        return self._parse_note(raw.decode('utf-8')), 'reparsed', record
+        
+    def _parse_note(self, content: str) -> Dict:
+        """Parse a note's content into the fields cached by the scan manifest, plus its 'tokens'."""
+        # One tokenizer pass; links in code blocks and frontmatter are not links
+        tokens = self._tokenize(content)
+        return {
+            'tokens': tokens,
+            'content': content,
+            'links': [token.target for token in tokens if token.kind == WIKI_LINK],
+            'embeds': [token.target for token in tokens if token.kind == EMBED],
+            'sections': SectionIndex.from_tokens(content, tokens).to_dict(),
+        }
+        
+    def _tokenize(self, content: str) -> List[Token]:
+        """Return a note's markdown tokens, from the parse cache when the text was seen before."""
+        if self.parse_cache is None:
+            return list(tokenize_markdown(content))
+        return self.parse_cache.tokens(content)
+        
+    def build_resolver(self) -> LinkResolver:
+        """Index every note under its file name, path suffixes and frontmatter aliases."""
+        self.resolver = LinkResolver()
+        for note in self.note_by_id:
+            self.resolver.add(note.id, note.relative, note.aliases)
+        return self.resolver
+        
+    def resolve_link(self, target: str, source: Optional[str] = None) -> Optional[str]:
+        """Return the name of the note a link target points at, or None if it is unresolved."""
+        if self.resolver is None:
+            self.build_resolver()
+        source_id = self.notes[source].id if source is not None else None
+        note_id = self.resolver.resolve(target, source_id)
+        return None if note_id is None else self.note_by_id[note_id].name
         
     def extract_existing_links(self):
         """Extract all existing wiki links from notes."""
         print("🔗 Extracting existing links...")
         
-        wiki_link_pattern = r'\[\[([^\]|]+)(?:\|([^\]]+))?\]\]'
+        self.build_resolver()
+        partial = PartialFeatures()
+        for note in self.note_by_id:
+            # Wiki links were parsed during the scan; note embeds count as links too
+            add_note_links(partial, self.resolver, note.id, note.links, note.embeds)
+        self._build_graph(partial)
+        
+        # Calculate link statistics
+        linking_notes = sum(1 for note in self.note_by_id if self.graph.out_degree(note.id))
+        print(f"  ✅ Found {self.graph.num_edges} links across {linking_notes} notes")
+        
+    def register_analyzer(self, analyzer: NoteAnalyzer):
+        """Add a custom analyzer to the single pass run by analyze_notes."""
+        self.analyzers.append(analyzer)
         
-        for note_name, note_data in self.notes.items():
-            content = note_data['content']
+    def analyze_notes(self):
+        """Run every analyzer (links, tags, concepts, mentions, duplicates and registered
+        custom ones) in one pass over each note's tokens.
+
+        Notes parsed by scan_vault reuse its tokens, so with the analyzer
+        pass each note is tokenized once per run; notes loaded from the
+        manifest are tokenized here (or read from the parse cache).
+
+        With ``processes`` > 1, links, concepts and mentions come from
+        extract_sharded instead and the pass runs the remaining analyzers.
+        """
+        if self.processes > 1:
+            self.extract_sharded()
+            analyzers = [TagAnalyzer(), DuplicateAnalyzer()]
+        else:
+            analyzers = default_analyzers()
+        analyzers += self.analyzers
+        
+        print(f"🔬 Running {len(analyzers)} analyzers in one pass over {len(self.note_by_id)} notes...")
+        self.mention_matcher = None
+        AnalyzerPass(analyzers, self.parse_cache).run(self, self.note_by_id, self._scan_tokens)
+        self._scan_tokens = {}
+        self._save_parse_cache()
+        
+    def extract_sharded(self):
+        """Extract links, concept hits and unlinked mentions on a pool of ``processes`` workers.
+
+        Each worker tokenizes and matches a shard of notes and returns
+        compact partial results, which are merged here into the link graph,
+        the concept index and per-note mention hits.
+        """
+        print(f"🧩 Extracting links, concepts and mentions on {self.processes} processes...")
+        
+        self.build_resolver()
+        self.build_mention_matcher()
+        variations = list(self.mention_targets)
+        keywords = concept_keywords(self.key_concepts)
+        # Workers decode token streams from the scan or the parse cache instead of tokenizing those notes
+        notes = []
+        for note in self.note_by_id:
+            tokens = self._scan_tokens.get(note.id)
+            if tokens is not None:
+                encoded = encode_tokens(tokens)
+            elif self.parse_cache is not None:
+                encoded = self.parse_cache.get(content_key(note.content), TOKENS_FIELD)
+            else:
+                encoded = None
+            notes.append((note.id, note.content, encoded))
+        partial = extract_features(notes, self.resolver, variations, keywords, self.processes)
+        self._build_graph(partial)
+        
+        self.concept_index = {keyword.lower(): set() for keyword in keywords}
+        for note_id, keyword in zip(partial.concept_notes, partial.concept_keywords):
+            self.concept_index[keywords[keyword].lower()].add(self.note_by_id[note_id].name)
             
-            # Find all wiki links
-            for match in re.finditer(wiki_link_pattern, content):
-                linked_note = match.group(1)
-                self.links[note_name].add(linked_note)
-                self.backlinks[linked_note].add(note_name)
+        self.mention_hits = defaultdict(list)
+        for note_id, start, end, variation, text in zip(partial.mention_notes, partial.mention_starts,
+                                                        partial.mention_ends, partial.mention_keywords,
+                                                        partial.mention_texts):
+            self.mention_hits[note_id].append((start, end, variations[variation], text))
+            
+        linking_notes = sum(1 for note in self.note_by_id if self.graph.out_degree(note.id))
+        print(f"  ✅ Found {self.graph.num_edges} links across {linking_notes} notes "
+              f"and {len(partial.mention_notes)} note name mentions")
+        
+    def _build_graph(self, partial: PartialFeatures):
+        """Build the link graph from extracted edges and check heading and block anchors."""
+        # Notes keep their IDs; link targets without a note get IDs after them
+        self.graph_names = [note.name for note in self.note_by_id] + [name for _, name in partial.unresolved]
+        self.node_ids = {note.name: note.id for note in self.note_by_id}
+        offset = len(self.note_by_id)
+        for i, (key, _) in enumerate(partial.unresolved):
+            self.node_ids[key] = offset + i
+        targets = array(INDEX_TYPECODE, (target if target >= 0 else offset - target - 1 for target in partial.targets))
+        
+        self.broken_anchors = [
+            (self.note_by_id[source].name, self.note_by_id[target].name, anchor)
+            for source, target, anchor in partial.anchors
+            if not self.note_by_id[target].sections.has_anchor(anchor)
+        ]
+        
+        previous = self.note_graph
+        self.graph = LinkGraph(len(self.graph_names), partial.sources, targets)
+        self.note_graph = self.graph.truncated(len(self.note_by_id))
+        self._invalidate_related(previous)
+        
+    def _invalidate_related(self, previous: Optional[LinkGraph]):
+        """Drop cached related-note queries that read a note whose links changed."""
+        if previous is None:
+            self._related_cache.clear()
+            return
+            
+        changed = {
+            node for node in range(self.note_graph.num_nodes)
+            if node >= previous.num_nodes
+            or self.note_graph.successors(node) != previous.successors(node)
+            or self.note_graph.predecessors(node) != previous.predecessors(node)
+        }
+        for source, (touched, _) in list(self._related_cache.items()):
+            if source in changed or not changed.isdisjoint(touched):
+                del self._related_cache[source]
                 
-        # Calculate link statistics
-        total_links = sum(len(links) for links in self.links.values())
-        print(f"  ✅ Found {total_links} links across {len(self.links)} notes")
+    def related_notes(self, note_name: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Return the k notes most related to one note by personalized PageRank.
+
+        Computed with a local push, so only the note's neighbourhood is
+        visited. Results are cached per note and dropped when the links of
+        any note the computation read change.
+        """
+        source = self.notes[note_name].id
+        cached = self._related_cache.get(source)
+        if cached is None:
+            scores, touched = personalized_pagerank(self.note_graph, source)
+            ranked = sorted(
+                ((self.note_by_id[node].name, score) for node, score in scores.items() if node != source),
+                key=lambda item: -item[1],
+            )
+            cached = self._related_cache[source] = (touched, ranked)
+        return cached[1][:k]
+        
+    def update_note(self, note_name: str):
+        """Re-read one note from disk and rebuild the link graph.
+
+        For editor integrations: cached related-note queries that depend on
+        the note's neighbourhood are invalidated, the rest stay warm.
+        Suggestions and reports are not recomputed.
+        """
+        note = self.notes[note_name]
+        with open(self.vault_path / note.relative, 'r', encoding='utf-8') as f:
+            parsed = self._parse_note(f.read())
+        parsed.pop('tokens')
+        self._add_note(note_name, note.relative, parsed)
+        self.mention_hits = None  # the note's offsets changed; scan mentions directly again
+        self.extract_existing_links()
+        
+    def is_linked(self, source: str, target: str) -> bool:
+        """Return True if the source note already links to the target note or link name."""
+        if target in self.notes:
+            target_id = self.notes[target].id
+        else:
+            resolved = self.resolve_link(target, source)
+            target_id = self.notes[resolved].id if resolved else self.node_ids.get(normalize_key(target))
+        return target_id is not None and self.graph.has_edge(self.notes[source].id, target_id)
+        
+    def find_unresolved_links(self, candidates: int = 3) -> Dict[str, Dict]:
+        """Index link targets without a note, with the closest existing note names as fixes."""
+        print("🩹 Finding unresolved links...")
+        
+        index = TrigramIndex([note.name for note in self.note_by_id])
+        self.unresolved_links = {}
+        for node in range(len(self.note_by_id), self.graph.num_nodes):
+            target = self.graph_names[node]
+            self.unresolved_links[target] = {
+                'sources': sorted(self.note_by_id[source].name for source in self.graph.predecessors(node)),
+                'candidates': index.closest(target, candidates),
+            }
+            
+        print(f"  ⚠️  Found {len(self.unresolved_links)} unresolved link targets")
+        return self.unresolved_links
         
     def identify_orphaned_notes(self):
-        """Find notes with no incoming or outgoing links."""
+        """Find notes with no links to or from another existing note."""
         print("🔍 Identifying orphaned notes...")
         
-        for note_name in self.notes:
-            if note_name not in self.links and note_name not in self.backlinks:
+        for note_name, note in self.notes.items():
+            # Links to missing notes do not connect a note to anything
+            if not self.note_graph.out_degree(note.id) and not self.note_graph.in_degree(note.id):
                 # Exclude some system files
                 if note_name not in ['README', 'git_integration_plan']:
                     self.orphaned_notes.add(note_name)
                     
         print(f"  ⚠️  Found {len(self.orphaned_notes)} orphaned notes")
         
-    def suggest_new_links(self):
-        """Suggest potential new links based on content analysis."""
+    def concept_matcher(self):
+        """Return the shared whole-word matcher for all key_concepts keywords."""
+        return compile_matcher(concept_keywords(self.key_concepts), word_boundaries=True)
+        
+    def build_concept_index(self):
+        """Build the inverted index from concept keywords to the notes containing them."""
+        keywords = concept_keywords(self.key_concepts)
+        self.concept_index = {keyword.lower(): set() for keyword in keywords}
+        matcher = self.concept_matcher()
+        
+        # One automaton pass per note finds every keyword
+        for note_name, note in self.notes.items():
+            for keyword in matcher.find_keywords(note.content, note.lower):
+                self.concept_index[keyword.lower()].add(note_name)
+                    
+    def build_mention_matcher(self, names: Optional[List[Tuple[str, str, List[str]]]] = None):
+        """Compile one whole-word matcher over every note's file name, aliases and their variations.
+
+        ``names`` lists (note name, file name, aliases) and defaults to every scanned note.
+        """
+        if names is None:
+            names = [(target_note, note.stem, note.aliases) for target_note, note in self.notes.items()]
+        self.mention_targets = defaultdict(list)
+        for target_note, stem, aliases in names:
+            variations = set()
+            for name in [stem] + aliases:
+                variations.update((name.lower(), name.replace('-', ' ').lower(), name.replace('_', ' ').lower()))
+            for variation in variations:
+                self.mention_targets[variation].append(target_note)
+                
+        self.mention_matcher = KeywordMatcher(self.mention_targets, word_boundaries=True)
+        
+    def find_unlinked_mentions(self, note_name: str):
+        """Yield (target, start, end) for each mention of another note that is not linked.
+
+        Mentions inside links, code and frontmatter are skipped, as are notes the note
+        already links to (by any name, with or without a heading anchor).
+        """
+        for target_note, start, end, _ in self._unlinked_mentions(note_name):
+            yield target_note, start, end
+            
+    def _unlinked_mentions(self, note_name: str):
+        """Like find_unlinked_mentions, but also yield the mention text."""
+        if self.mention_matcher is None:
+            self.build_mention_matcher()
+            
+        note = self.notes[note_name]
+        linked = {self.note_by_id[target_id].name for target_id in self.note_graph.successors(note.id)}
+        
+        for start, end, variation, text in self._mentions(note):
+            for target_note in self.mention_targets[variation]:
+                if target_note != note_name and target_note not in linked:
+                    yield target_note, start, end, text
+                    
+    def _mentions(self, note: Note):
+        """Yield (start, end, variation, text) for name mentions outside links, code and frontmatter."""
+        if self.mention_hits is not None:
+            # Already found by sharded extraction
+            yield from self.mention_hits.get(note.id, ())
+            return
+            
+        # Sorted, non-overlapping spans for containment checks
+        span_starts, span_ends = [], []
+        for token in protected_spans(self._tokenize(note.content)):
+            span_starts.append(token.start)
+            span_ends.append(token.end)
+            
+        for start, end, variation in self.mention_matcher.finditer(note.content, note.lower):
+            i = bisect_right(span_starts, start) - 1
+            if i >= 0 and start < span_ends[i]:
+                continue
+            yield start, end, variation, note.content[start:end]
+            
+    def suggest_new_links(self, concept_candidates: int = 50):
+        """Suggest potential new links based on content analysis.
+
+        Candidates from shared concepts, unlinked mentions and TF-IDF
+        similarity are collected one note at a time, scored, and streamed
+        through a bounded heap so each note keeps only its best
+        ``suggestions_per_note`` suggestions. Notes that only share concepts
+        are pruned to the ``concept_candidates`` sharing the most before
+        scoring, since widespread concepts would otherwise pair almost
+        every two notes.
+        """
         print("💡 Analyzing content for potential links...")
         
-        for note_name, note_data in self.notes.items():
-            content = note_data['content'].lower()
-            
-            # Check for key concepts
-            for concept, keywords in self.key_concepts.items():
-                for keyword in keywords:
-                    if keyword.lower() in content:
-                        # Look for notes that might be related
-                        for target_note in self.notes:
-                            if target_note != note_name and target_note not in self.links[note_name]:
-                                target_content = self.notes[target_note]['content'].lower()
-                                
-                                # Check if target is about this concept
-                                if any(kw.lower() in target_content for kw in keywords[:2]):
-                                    reason = f"Both discuss {concept}"
-                                    self.potential_links[note_name].append((target_note, reason))
-                                    
+        if self.mention_hits is None:
+            # Otherwise the sharded extraction already built the concept index
+            self.build_concept_index()
+        note_order = {note_name: i for i, note_name in enumerate(self.notes)}
+        
+        # Per concept: notes mentioning any keyword, and notes about it (first two keywords)
+        concept_notes = {}
+        for concept, keywords in self.key_concepts.items():
+            mentioning = set().union(*(self.concept_index[kw.lower()] for kw in keywords))
+            about = set().union(*(self.concept_index[kw.lower()] for kw in keywords[:2]))
+            concept_notes[concept] = (mentioning, about)
+            
+        if self.mention_hits is None:
+            self.build_mention_matcher()
+        similar = self.find_similar_notes() if self.similarity_top_k else None
+        predictions = self.link_predictions or self.compute_link_predictions()
+        considered = 0
+        
+        zero_scores = dict.fromkeys(predictions, 0.0)
+        
+        for note_name, note in self.notes.items():
+            # target -> [shared concepts, mention count, first mention text, cosine]
+            candidates = defaultdict(lambda: [[], 0, None, 0.0])
+            linked = {self.note_by_id[target_id].name for target_id in self.note_graph.successors(note.id)}
+            linked.add(note_name)
+            
             # Check for direct name mentions without links
-            for target_note in self.notes:
-                if target_note != note_name:
-                    # Create variations of the target note name
-                    variations = [
-                        target_note,
-                        target_note.replace('-', ' '),
-                        target_note.replace('_', ' '),
-                        target_note.lower(),
-                    ]
+            for target_note, _, _, text in self._unlinked_mentions(note_name):
+                candidate = candidates[target_note]
+                candidate[1] += 1
+                if candidate[2] is None:
+                    candidate[2] = text
                     
-                    for variation in variations:
-                        if variation in content and target_note not in self.links[note_name]:
-                            # Check it's not already linked with different text
-                            if f"[[{target_note}" not in note_data['content']:
-                                reason = f"Mentions '{variation}' without link"
-                                self.potential_links[note_name].append((target_note, reason))
-                                break
-                                
-        # Deduplicate suggestions
-        for note in self.potential_links:
-            unique_suggestions = {}
-            for target, reason in self.potential_links[note]:
-                if target not in unique_suggestions:
-                    unique_suggestions[target] = reason
-            self.potential_links[note] = list(unique_suggestions.items())
+            # Check for similar content
+            if similar:
+                for other_id, cosine in similar[note.id]:
+                    candidates[self.note_by_id[other_id].name][3] = cosine
+                    
+            # Check for shared link neighbourhoods
+            graph_rows = {}
+            for measure, scores in predictions.items():
+                graph_rows[measure] = dict(scores.row(note.id))
+                for other_id, _ in scores.top_k(note.id, self.suggestions_per_note):
+                    candidates[self.note_by_id[other_id].name]
+            nonzero = set().union(*graph_rows.values())
             
+            # Check for key concepts; only the targets sharing the most concepts are kept
+            # unless another signal already made them candidates
+            note_concepts = [
+                (concept, about) for concept, (mentioning, about) in concept_notes.items() if note_name in mentioning
+            ]
+            shared = Counter()
+            for _, about in note_concepts:
+                shared.update(about)
+            for target_note in linked:
+                shared.pop(target_note, None)
+            kept = shared
+            if len(shared) > concept_candidates:
+                # Lowest shared-concept count that still makes the cut; ties go in note order
+                histogram = Counter(shared.values())
+                cutoff = total = 0
+                for count in sorted(histogram, reverse=True):
+                    cutoff, total = count, total + histogram[count]
+                    if total >= concept_candidates:
+                        break
+                kept = [target_note for target_note, count in shared.items() if count > cutoff]
+                ties = sorted((target_note for target_note, count in shared.items() if count == cutoff),
+                              key=note_order.__getitem__)
+                kept.extend(ties[:concept_candidates - len(kept)])
+                kept.extend(target_note for target_note in candidates if target_note in shared)
+            for target_note in sorted(kept, key=note_order.__getitem__):
+                concepts = candidates[target_note][0]
+                if not concepts:
+                    concepts.extend(concept for concept, about in note_concepts if target_note in about)
+                    
+            heap = []
+            for target_note, (concepts, mentions, mention_text, cosine) in candidates.items():
+                if target_note in linked:
+                    continue
+                considered += 1
+                target_id = self.notes[target_note].id
+                if target_id in nonzero:
+                    graph_scores = {measure: row.get(target_id, 0.0) for measure, row in graph_rows.items()}
+                else:
+                    graph_scores = zero_scores
+                score, signal, reason = self._score_suggestion(concepts, mentions, mention_text, cosine, graph_scores)
+                entry = (score, -note_order[target_note], target_note, reason, signal)
+                if len(heap) < self.suggestions_per_note:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heappushpop(heap, entry)
+                    
+            if heap:
+                self.potential_links[note_name] = [
+                    (target_note, reason, score)
+                    for score, _, target_note, reason, _ in sorted(heap, reverse=True)
+                ]
+                
+            # Point kept suggestions at the section that matches the mention or concept;
+            # a mention names the target note itself, so it gets no anchor
+            for _, _, target_note, _, signal in heap:
+                if signal == 'mention':
+                    continue
+                concepts, _, mention_text, _ = candidates[target_note]
+                terms = [mention_text.lower()] if mention_text else []
+                terms.extend(keyword.lower() for concept in concepts for keyword in self.key_concepts[concept][:2])
+                title = self.notes[target_note].sections.find_title(terms)
+                if title:
+                    self.link_sections[(note_name, target_note)] = title
+                    
         total_suggestions = sum(len(suggestions) for suggestions in self.potential_links.values())
-        print(f"  ✅ Generated {total_suggestions} link suggestions")
+        print(f"  ✅ Kept {total_suggestions} of {considered} scored link suggestions")
+        
+    def link_text(self, source: str, target: str) -> str:
+        """Return the wiki link target for a suggestion, with its heading anchor if one was found."""
+        title = self.link_sections.get((source, target))
+        return f"{target}#{title}" if title else target
+        
+    def compute_link_predictions(self, max_degree: int = 100) -> Dict:
+        """Compute co-citation, bibliographic coupling and Adamic-Adar scores between notes."""
+        self.link_predictions = {
+            'cocitation': cocitation(self.note_graph, max_degree),
+            'coupling': bibliographic_coupling(self.note_graph, max_degree),
+            'adamic_adar': adamic_adar(self.note_graph, max_degree),
+        }
+        return self.link_predictions
+        
+    def _score_suggestion(self, concepts: List[str], mentions: int, mention_text: Optional[str],
+                          cosine: float, graph_scores: Dict[str, float]) -> Tuple[float, str, str]:
+        """Combine suggestion signals into a score; return it with the strongest signal and a reason naming it."""
+        contributions = {
+            'concept': SUGGESTION_WEIGHTS['concept'] * len(concepts),
+            'mention': SUGGESTION_WEIGHTS['mention'] * math.log2(1 + mentions),
+            'similarity': SUGGESTION_WEIGHTS['similarity'] * cosine,
+        }
+        for measure, value in graph_scores.items():
+            contributions[measure] = SUGGESTION_WEIGHTS[measure] * value
+        strongest = max(contributions, key=contributions.get)
+        
+        if strongest == 'mention':
+            reason = f"Mentions '{mention_text}' without link"
+        elif strongest == 'similarity':
+            reason = f"Similar content (cosine {cosine:.2f})"
+        elif strongest == 'concept':
+            more = f" and {len(concepts) - 3} more" if len(concepts) > 3 else ""
+            reason = f"Both discuss {', '.join(concepts[:3])}{more}"
+        elif strongest == 'cocitation':
+            reason = f"Co-cited by {graph_scores['cocitation']:.0f} notes"
+        elif strongest == 'coupling':
+            reason = f"Links to {graph_scores['coupling']:.0f} of the same notes"
+        else:
+            reason = f"Shares linked notes (Adamic-Adar {graph_scores['adamic_adar']:.2f})"
+        return round(sum(contributions.values()), 3), strongest, reason
+        
+    def analyze_tags(self, limit: int = 10) -> List[Tuple[str, int, int]]:
+        """Return (tag, notes, links between those notes) for the most used tags."""
+        rows = []
+        for tag, names in sorted(self.tag_index.items(), key=lambda item: (-len(item[1]), item[0]))[:limit]:
+            note_ids = {self.notes[name].id for name in names}
+            links = sum(1 for note_id in note_ids for target_id in self.note_graph.successors(note_id)
+                        if target_id in note_ids and target_id != note_id)
+            rows.append((tag, len(note_ids), links))
+        return rows
+        
+    def build_tfidf(self, term_counts: Optional[TermCounts] = None) -> TfidfMatrix:
+        """Build the TF-IDF matrix over all notes, from note text or per-note term counts."""
+        if term_counts is not None:
+            self.tfidf = TfidfMatrix([], term_counts=term_counts)
+        else:
+            self.tfidf = TfidfMatrix([terms(note.words) for note in self.note_by_id])
+        return self.tfidf
+        
+    def find_similar_notes(self, min_score: float = 0.2) -> List[List[Tuple[int, float]]]:
+        """Return each note's top-k TF-IDF cosine neighbours, indexed by note ID."""
+        if not (self.streaming and self.tfidf is not None):
+            # Note text is gone after a streaming scan; its pass already built the matrix
+            self.build_tfidf()
+        return self.tfidf.top_k_similar(self.similarity_top_k, min_score)
+        
+    def rank_notes(self) -> Dict[str, Dict[str, float]]:
+        """Score every note by PageRank, HITS hub/authority and k-core number."""
+        print("🏆 Ranking notes...")
+        
+        # Missing link targets would soak up rank mass and inflate core numbers
+        ranks = pagerank(self.note_graph)
+        hub_scores, authority_scores = hits(self.note_graph)
+        cores = core_numbers(self.note_graph)
+        
+        self.rankings = {
+            note_name: {
+                'pagerank': ranks[note.id],
+                'hub': hub_scores[note.id],
+                'authority': authority_scores[note.id],
+                'core': cores[note.id],
+            }
+            for note_name, note in self.notes.items()
+        }
+        return self.rankings
+        
+    def analyze_structure(self) -> Dict:
+        """Find connected components, link cycles, bridge links and articulation notes."""
+        print("🧭 Analyzing graph structure...")
+        
+        names = [note.name for note in self.note_by_id]
+        weak = group_labels(weakly_connected_components(self.note_graph))
+        strong = group_labels(strongly_connected_components(self.note_graph))
+        bridges, articulation = bridges_and_articulation_points(self.note_graph)
+        
+        self.structure = {
+            'clusters': [[names[node] for node in members] for members in weak],
+            'cycles': [[names[node] for node in members] for members in strong if len(members) > 1],
+            'bridges': [(names[a], names[b]) for a, b in bridges],
+            'articulation_notes': sorted(names[node] for node in articulation),
+        }
+        
+        print(f"  ✅ Found {len(weak)} clusters, {len(bridges)} bridge links "
+              f"and {len(articulation)} articulation notes")
+        return self.structure
+        
+    def folder_of(self, note_name: str) -> str:
+        """Return the note's top-level folder, or its project subtree under Projects/."""
+        parts = self.notes[note_name].path.parts[:-1]
+        if not parts:
+            return '(root)'
+        if parts[0] == 'Projects' and len(parts) > 1:
+            return f"Projects/{parts[1]}"
+        return parts[0]
+        
+    def detect_communities(self) -> List[Dict]:
+        """Find link communities by label propagation and compare them with the folder layout."""
+        print("🏘️  Detecting communities...")
+        
+        labels = label_propagation(self.note_graph)
+        self.communities = []
+        for members in group_labels(labels):
+            notes = [self.note_by_id[node].name for node in members]
+            folders = Counter(self.folder_of(note) for note in notes)
+            dominant, count = folders.most_common(1)[0]
+            self.communities.append({
+                'notes': notes,
+                'folders': folders,
+                'dominant_folder': dominant,
+                'folder_share': count / len(notes),
+            })
+            
+        linked = [c for c in self.communities if len(c['notes']) > 1]
+        print(f"  ✅ Found {len(linked)} communities of linked notes")
+        return self.communities
+        
+    def analyze_folder_connectivity(self, max_pairs: int = 5) -> Dict:
+        """Count links between folders and find weakly connected folder pairs worth bridging.
+        
+        Each weak pair comes with the best-scored suggestion crossing it, so
+        the recommendation points at a concrete link to add.
+        """
+        print("🗂️  Analyzing folder connectivity...")
+        
+        folders = sorted({self.folder_of(note.name) for note in self.note_by_id})
+        folder_ids = {folder: i for i, folder in enumerate(folders)}
+        groups = [folder_ids[self.folder_of(note.name)] for note in self.note_by_id]
+        matrix = block_connectivity(self.note_graph, groups, len(folders))
+        sizes = Counter(groups)
+        
+        # Best suggestion crossing each folder pair, in either direction
+        crossing = {}
+        for source, suggestions in self.potential_links.items():
+            source_group = groups[self.notes[source].id]
+            for target, reason, score in suggestions:
+                target_group = groups[self.notes[target].id]
+                if target_group == source_group:
+                    continue
+                pair = (min(source_group, target_group), max(source_group, target_group))
+                if pair not in crossing or score > crossing[pair][0]:
+                    crossing[pair] = (score, source, target, reason)
+                    
+        pairs = []
+        for a in range(len(folders)):
+            for b in range(a + 1, len(folders)):
+                if sizes[a] < 2 or sizes[b] < 2 or (a, b) not in crossing:
+                    continue
+                links = matrix[a][b] + matrix[b][a]
+                density = links / (2 * sizes[a] * sizes[b])
+                pairs.append((density, -sizes[a] * sizes[b], a, b, links))
+        pairs.sort()
+        
+        weakest = []
+        for density, _, a, b, links in pairs[:max_pairs]:
+            score, source, target, reason = crossing[(a, b)]
+            weakest.append({
+                'folders': (folders[a], folders[b]),
+                'links': links,
+                'density': density,
+                'suggestion': (source, target, reason, score),
+            })
+            
+        self.folder_links = {
+            'folders': folders,
+            'sizes': [sizes[i] for i in range(len(folders))],
+            'matrix': matrix,
+            'weakest': weakest,
+        }
+        
+        print(f"  ✅ Mapped links between {len(folders)} folders, {len(weakest)} weak pairs to bridge")
+        return self.folder_links
+        
+    def detect_near_duplicates(self, threshold: float = 0.7, features: Optional[Tuple] = None,
+                               signatures: Optional[Tuple] = None) -> List[Tuple[str, str, float]]:
+        """Find pairs of notes whose word shingles overlap by at least the threshold.
+
+        ``features`` holds precomputed (shingle sets, digests) in note ID
+        order, as collected by the analyzer pass. ``signatures`` holds
+        (MinHash signatures, digests) from a streaming scan instead, and
+        similarities are then estimated from the signatures.
+        """
+        print("👯 Detecting near-duplicate notes...")
+        
+        if signatures is not None:
+            pairs = near_duplicate_signatures(*signatures, threshold=threshold)
+        elif features is not None:
+            pairs = near_duplicate_pairs(*features, threshold=threshold)
+        else:
+            pairs = near_duplicate_pairs([word_shingles(note.words) for note in self.note_by_id],
+                                         [content_digest(note.content) for note in self.note_by_id], threshold)
+        self.near_duplicates = [
+            (self.note_by_id[i].name, self.note_by_id[j].name, similarity)
+            for i, j, similarity in pairs
+        ]
+        
+        print(f"  ✅ Found {len(self.near_duplicates)} near-duplicate pairs")
+        return self.near_duplicates
         
     def analyze_link_density(self):
         """Analyze the link density and connectivity of the graph."""
@@ -172,21 +917,28 @@ class ObsidianLinkGenerator:
         # Calculate metrics
         total_notes = len(self.notes)
         total_possible_links = total_notes * (total_notes - 1)
-        actual_links = sum(len(links) for links in self.links.values())
+        # Links to notes that do not exist are reported separately, not counted
+        actual_links = self.note_graph.num_edges
         link_density = (actual_links / total_possible_links * 100) if total_possible_links > 0 else 0
         
         # Find most connected notes
         connection_counts = Counter()
-        for note in self.notes:
-            connections = len(self.links.get(note, set())) + len(self.backlinks.get(note, set()))
-            connection_counts[note] = connections
+        for note_name, note in self.notes.items():
+            connections = self.note_graph.out_degree(note.id) + self.note_graph.in_degree(note.id)
+            connection_counts[note_name] = connections
+            
+        if not self.rankings:
+            self.rank_notes()
+        most_central = sorted(self.rankings.items(), key=lambda item: item[1]['pagerank'], reverse=True)
             
         return {
             'total_notes': total_notes,
             'total_links': actual_links,
             'link_density': link_density,
             'most_connected': connection_counts.most_common(10),
-            'orphaned_count': len(self.orphaned_notes)
+            'most_central': most_central[:10],
+            'orphaned_count': len(self.orphaned_notes),
+            'unresolved_count': sum(len(entry['sources']) for entry in self.unresolved_links.values()),
         }
         
     def generate_report(self):
@@ -215,6 +967,7 @@ This report analyzes the link structure of the Claude Ecosystem Knowledge Graph,
 - **Total Links**: {metrics['total_links']}
 - **Link Density**: {metrics['link_density']:.2f}%
 - **Orphaned Notes**: {metrics['orphaned_count']}
+- **Unresolved Links**: {metrics['unresolved_count']} (to {len(self.unresolved_links)} missing notes)
 
 ## Most Connected Notes
 
@@ -225,40 +978,129 @@ This report analyzes the link structure of the Claude Ecosystem Knowledge Graph,
         for note, count in metrics['most_connected']:
             report += f"| [[{note}]] | {count} |\n"
             
+        report += """
+## Most Central Notes
+
+Ranked by PageRank, so notes that are linked to by well-linked notes rank above notes that only link out a lot. Authority and hub are HITS scores; core is the note's k-core number.
+
+| Note | PageRank | Authority | Hub | Core |
+|------|----------|-----------|-----|------|
+"""
+        for note, scores in metrics['most_central']:
+            report += (f"| [[{note}]] | {scores['pagerank']:.4f} | {scores['authority']:.4f} "
+                       f"| {scores['hub']:.4f} | {scores['core']} |\n")
+            
         # Add orphaned notes section
         if self.orphaned_notes:
-            report += "\n## Orphaned Notes\n\nThese notes have no incoming or outgoing links:\n\n"
+            report += "\n## Orphaned Notes\n\nThese notes have no links to or from another existing note:\n\n"
             for note in sorted(self.orphaned_notes):
                 report += f"- [[{note}]]\n"
                 
+        # Add unresolved links section
+        if self.unresolved_links:
+            report += "\n## Unresolved Links\n\nThese link targets have no matching note:\n\n"
+            report += "| Target | Linked From | Closest Notes |\n|--------|-------------|---------------|\n"
+            for target, entry in sorted(self.unresolved_links.items(), key=lambda item: (-len(item[1]['sources']), item[0])):
+                sources = ', '.join(f"[[{source}]]" for source in entry['sources'][:5])
+                if len(entry['sources']) > 5:
+                    sources += f" +{len(entry['sources']) - 5}"
+                closest = ', '.join(f"[[{name}]] ({score:.0%})" for name, score in entry['candidates']) or '—'
+                report += f"| `{target}` | {sources} | {closest} |\n"
+                
+        # Add broken heading and block links
+        if self.broken_anchors:
+            report += "\n## Broken Section Links\n\nThese links name a heading or block that the target note does not have:\n\n"
+            for source, target, anchor in self.broken_anchors[:30]:
+                report += f"- [[{source}]] → `[[{target}#{anchor}]]`\n"
+                
+        # Add near-duplicates section
+        if self.near_duplicates is None:
+            self.detect_near_duplicates()
+        if self.near_duplicates:
+            report += "\n## Near-Duplicate Notes\n\nThese notes share most of their text and may need merging:\n\n"
+            report += "| Note | Duplicate | Similarity |\n|------|-----------|------------|\n"
+            for first, second, similarity in self.near_duplicates[:30]:
+                first_path, second_path = self.notes[first].relative, self.notes[second].relative
+                report += f"| [[{first}]] (`{first_path}`) | [[{second}]] (`{second_path}`) | {similarity:.0%} |\n"
+                
+        # Add tags section
+        tags = self.analyze_tags()
+        if tags:
+            report += ("\n## Tags\n\nThe most used tags and the links among the notes carrying each; "
+                       "a tag whose notes barely link to each other marks a topic worth connecting:\n\n")
+            report += "| Tag | Notes | Links Between Them |\n|-----|-------|--------------------|\n"
+            for tag, count, links in tags:
+                report += f"| `#{tag}` | {count} | {links} |\n"
+                
         # Add suggested links section
         report += "\n## Suggested New Links\n\n"
         
         # Group suggestions by reason type
         suggestion_groups = defaultdict(list)
         for source, suggestions in self.potential_links.items():
-            for target, reason in suggestions[:5]:  # Limit to top 5 per note
-                suggestion_groups[reason.split()[0]].append((source, target, reason))
+            for target, reason, score in suggestions[:5]:  # Limit to top 5 per note
+                suggestion_groups[reason.split()[0]].append((score, source, target, reason))
                 
         for reason_type, suggestions in suggestion_groups.items():
             report += f"### {reason_type} References\n\n"
-            for source, target, reason in suggestions[:20]:  # Limit each category
-                report += f"- [[{source}]] → [[{target}]] ({reason})\n"
+            suggestions.sort(key=lambda item: -item[0])
+            for score, source, target, reason in suggestions[:20]:  # Limit each category
+                report += f"- [[{source}]] → [[{self.link_text(source, target)}]] ({reason}; score {score:.2f})\n"
             report += "\n"
             
         # Add network analysis
-        report += """## Network Analysis
+        if not self.structure:
+            self.analyze_structure()
+        clusters = self.structure['clusters']
+        cycles = self.structure['cycles']
+        articulation_notes = self.structure['articulation_notes']
+        hubs = ', '.join(f"[[{note}]]" for note, _ in metrics['most_central'][:3]) or 'none'
+        largest_cycle = len(cycles[0]) if cycles else 0
+        
+        report += f"""## Network Analysis
 
 ### Key Observations
 
-1. **Hub Notes**: The most connected notes serve as central concepts linking different areas
-2. **Clustering**: Notes naturally cluster around projects (UltraThink, CAM, Contexify)
-3. **Bridge Concepts**: Some notes bridge between different philosophical approaches
+1. **Hub Notes**: {hubs} carry the most link weight (highest PageRank)
+2. **Clustering**: The notes form {len(clusters)} connected clusters; the largest holds {len(clusters[0]) if clusters else 0} of {metrics['total_notes']} notes. {sum(len(cycle) for cycle in cycles)} notes sit in link cycles, the largest spanning {largest_cycle} notes
+3. **Bridge Notes**: {len(articulation_notes)} notes hold their cluster together; removing any of them splits it
+
+### Clusters
 
+"""
+        for i, members in enumerate(clusters[:10], 1):
+            shown = ', '.join(f"[[{note}]]" for note in members[:8])
+            more = f" and {len(members) - 8} more" if len(members) > 8 else ""
+            label = 'note' if len(members) == 1 else 'notes'
+            report += f"{i}. {len(members)} {label}: {shown}{more}\n"
+            
+        report += self._communities_section(metrics['total_notes'])
+        report += self._folder_connectivity_section()
+        
+        if articulation_notes:
+            report += "\n### Bridge Notes\n\n"
+            for note in articulation_notes[:20]:
+                report += f"- [[{note}]]\n"
+                
+        if self.structure['bridges']:
+            report += "\n### Bridge Links\n\nEach of these is the only connection between two parts of a cluster:\n\n"
+            for source, target in self.structure['bridges'][:20]:
+                report += f"- [[{source}]] ↔ [[{target}]]\n"
+                
+        weakest = self.folder_links['weakest']
+        if weakest:
+            first, second = weakest[0]['folders']
+            source, target, _, _ = weakest[0]['suggestion']
+            cross_links = (f"{first} and {second} are among the least connected folders; "
+                           f"start with [[{source}]] → [[{target}]] (see Folder Connectivity)")
+        else:
+            cross_links = "No weakly connected folder pair has a scored link candidate"
+            
+        report += f"""
 ### Recommendations
 
 1. **Connect Orphaned Notes**: Review orphaned notes and add relevant links
-2. **Strengthen Cross-Project Links**: Add more connections between project boundaries
+2. **Strengthen Cross-Folder Links**: {cross_links}
 3. **Bidirectional Links**: Ensure important relationships have links in both directions
 4. **Concept Definitions**: Link to concept definitions when terms are mentioned
 
@@ -289,6 +1131,87 @@ To implement suggested links:
         # Also create a quick fixes file
         self.generate_quick_fixes()
         
+    def _see_also(self, note_name: str, count: int = 3) -> List[str]:
+        """Pick "See Also" targets: the best-scored suggestions, else the folder's top-ranked notes."""
+        targets = [target for target, _, _ in self.potential_links.get(note_name, [])[:count]]
+        if targets:
+            return targets
+            
+        # Nothing scored; fall back to the most central notes in the same folder
+        folder = self.notes[note_name].path.parent
+        if not self.rankings:
+            self.rank_notes()
+        siblings = [
+            other for other, other_note in self.notes.items()
+            if other != note_name and other_note.path.parent == folder
+        ]
+        siblings.sort(key=lambda other: -self.rankings[other]['pagerank'])
+        return siblings[:count]
+        
+    def _communities_section(self, total_notes: int) -> str:
+        """Render detected communities and how well they line up with folders."""
+        if not self.communities:
+            self.detect_communities()
+        linked = [c for c in self.communities if len(c['notes']) > 1]
+        
+        # Purity: share of notes whose community is dominated by their own folder
+        matching = sum(c['folders'][c['dominant_folder']] for c in self.communities)
+        purity = matching / total_notes if total_notes else 0
+        spread = Counter()
+        for community in linked:
+            for folder in community['folders']:
+                spread[folder] += 1
+                
+        section = f"""
+### Communities
+
+Label propagation over the link graph finds {len(linked)} {'community' if len(linked) == 1 else 'communities'} of linked notes. {purity:.0%} of notes sit in a community dominated by their own folder.
+
+| # | Notes | Dominant Folder | Folder Share | Members |
+|---|-------|-----------------|--------------|---------|
+"""
+        for i, community in enumerate(linked[:10], 1):
+            shown = ', '.join(f"[[{note}]]" for note in community['notes'][:6])
+            more = f" +{len(community['notes']) - 6}" if len(community['notes']) > 6 else ""
+            section += (f"| {i} | {len(community['notes'])} | {community['dominant_folder']} "
+                        f"| {community['folder_share']:.0%} | {shown}{more} |\n")
+                        
+        split = [(folder, count) for folder, count in spread.most_common() if count > 1]
+        if split:
+            section += "\nFolders whose notes are split across communities:\n\n"
+            for folder, count in split:
+                section += f"- {folder}: {count} communities\n"
+        return section
+        
+    def _folder_connectivity_section(self) -> str:
+        """Render the folder link matrix and the weakest folder pairs."""
+        if not self.folder_links:
+            self.analyze_folder_connectivity()
+        folders = self.folder_links['folders']
+        matrix = self.folder_links['matrix']
+        
+        section = """
+### Folder Connectivity
+
+Links from each folder (row) to each folder (column):
+
+"""
+        section += "| From \\ To | " + " | ".join(f"{i}" for i in range(1, len(folders) + 1)) + " |\n"
+        section += "|" + "---|" * (len(folders) + 1) + "\n"
+        for i, folder in enumerate(folders):
+            section += f"| {i + 1}. {folder} ({self.folder_links['sizes'][i]}) | "
+            section += " | ".join(str(count) if count else "·" for count in matrix[i]) + " |\n"
+            
+        if self.folder_links['weakest']:
+            section += "\nWeakest folder pairs with a link candidate:\n\n"
+            for pair in self.folder_links['weakest']:
+                first, second = pair['folders']
+                source, target, reason, score = pair['suggestion']
+                label = 'link' if pair['links'] == 1 else 'links'
+                section += (f"- {first} ↔ {second}: {pair['links']} {label} "
+                            f"— add [[{source}]] → [[{target}]] ({reason}; score {score:.2f})\n")
+        return section
+        
     def generate_quick_fixes(self):
         """Generate a file with quick link additions that can be easily applied."""
         print("🔧 Generating quick fixes file...")
@@ -313,33 +1236,37 @@ Copy and paste these snippets to quickly add suggested links.
             fixes += f"\n#### {note}\n"
             fixes += "Add to bottom of note:\n```markdown\n## See Also\n"
             
-            # Suggest related notes based on name/location
-            note_path = str(self.notes[note]['path'])
-            if 'UltraThink' in note_path:
-                fixes += "- [[Claude-UltraThink]]\n- [[Single-Agent-Architecture]]\n"
-            elif 'CAM' in note_path or 'Claude-AM' in note_path:
-                fixes += "- [[Claude-AM]]\n- [[Multi-Agent-Orchestration]]\n"
-            elif 'Contexify' in note_path:
-                fixes += "- [[Claude-Contexify]]\n- [[Context-Window-Reality]]\n"
+            for target in self._see_also(note):
+                fixes += f"- [[{target}]]\n"
                 
             fixes += "```\n"
             
+        # Add repairs for broken links that have a close match
+        repairs = [
+            (target, entry) for target, entry in sorted(self.unresolved_links.items())
+            if entry['candidates'] and entry['candidates'][0][1] >= 0.85
+        ]
+        if repairs:
+            fixes += "\n### Broken Link Repairs\n\n"
+            for target, entry in repairs:
+                replacement = entry['candidates'][0][0]
+                fixes += f"- `[[{target}]]` → `[[{replacement}]]` in {', '.join(entry['sources'])}\n"
+                
         # Add top link suggestions
         fixes += "\n### Top Link Suggestions\n\n"
         
-        added = 0
-        for source, suggestions in self.potential_links.items():
-            if added >= 20:
-                break
-                
-            for target, reason in suggestions[:2]:
-                if added >= 20:
-                    break
-                    
-                fixes += f"**{source}** → [[{target}]]\n"
-                fixes += f"- Reason: {reason}\n"
-                fixes += f"- Add: `[[{target}]]` where relevant\n\n"
-                added += 1
+        top_suggestions = heapq.nlargest(
+            20,
+            ((score, source, target, reason)
+             for source, suggestions in self.potential_links.items()
+             for target, reason, score in suggestions[:2]),
+            key=lambda item: item[0],
+        )
+        for score, source, target, reason in top_suggestions:
+            link = self.link_text(source, target)
+            fixes += f"**{source}** → [[{link}]]\n"
+            fixes += f"- Reason: {reason} (score {score:.2f})\n"
+            fixes += f"- Add: `[[{link}]]` where relevant\n\n"
                 
         # Write fixes file
         fixes_path = self.vault_path / 'quick-link-fixes.md'
@@ -354,9 +1281,16 @@ Copy and paste these snippets to quickly add suggested links.
         
         # Linear processing - one task at a time
         self.scan_vault()
-        self.extract_existing_links()
+        if not self.streaming:
+            # A streaming scan analyzes each note as it reads it
+            self.analyze_notes()
+        self.find_unresolved_links()
         self.identify_orphaned_notes()
         self.suggest_new_links()
+        self.rank_notes()
+        self.analyze_structure()
+        self.detect_communities()
+        self.analyze_folder_connectivity()
         self.generate_report()
         
         print("✨ Link analysis complete!")
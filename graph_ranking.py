@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Node ranking over a `LinkGraph`: PageRank, HITS, k-core numbers and
+personalized PageRank for single-note "related notes" queries.
+
+With NumPy installed, every iteration is a sparse matrix-vector product
+expressed as ``np.bincount`` over the CSR edge arrays, so a 100k-edge vault
+ranks in milliseconds. Without NumPy the same algorithms run as plain
+Python loops over the edge arrays. K-core numbers always use linear bucket
+peeling, so long chains such as daily notes cost no more than any other
+graph of the same size.
+"""
+
+from collections import deque
+from typing import Dict, List, Set, Tuple
+
+from graph_structure import undirected_csr
+from link_graph import LinkGraph
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to pure Python
+    np = None
+
+
+def _np_edges(graph: LinkGraph):
+    sources, targets = graph.edge_arrays()
+    return np.frombuffer(sources, dtype=np.intc), np.frombuffer(targets, dtype=np.intc)
+
+
+def pagerank(graph: LinkGraph, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100) -> List[float]:
+    """Return the PageRank of every node, summing to 1.
+
+    Rank held by nodes without outgoing links is spread evenly over all
+    nodes on each iteration.
+    """
+    n = graph.num_nodes
+    if n == 0:
+        return []
+
+    if np is not None:
+        sources, targets = _np_edges(graph)
+        out_degree = np.bincount(sources, minlength=n).astype(float)
+        dangling = out_degree == 0
+        inv_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(targets, weights=(rank * inv_degree)[sources], minlength=n)
+            new_rank = damping * spread + (damping * rank[dangling].sum() + 1.0 - damping) / n
+            delta = np.abs(new_rank - rank).sum()
+            rank = new_rank
+            if delta < tol:
+                break
+        return rank.tolist()
+
+    sources, targets = graph.edge_arrays()
+    out_degree = [graph.out_degree(node) for node in range(n)]
+    rank = [1.0 / n] * n
+    for _ in range(max_iter):
+        dangling_rank = sum(rank[node] for node in range(n) if not out_degree[node])
+        base = (damping * dangling_rank + 1.0 - damping) / n
+        new_rank = [base] * n
+        for source, target in zip(sources, targets):
+            new_rank[target] += damping * rank[source] / out_degree[source]
+        delta = sum(abs(a - b) for a, b in zip(new_rank, rank))
+        rank = new_rank
+        if delta < tol:
+            break
+    return rank
+
+
+def hits(graph: LinkGraph, tol: float = 1e-10, max_iter: int = 100) -> Tuple[List[float], List[float]]:
+    """Return (hub, authority) scores for every node, each normalized to sum to 1."""
+    n = graph.num_nodes
+    if n == 0:
+        return [], []
+
+    if np is not None:
+        sources, targets = _np_edges(graph)
+        hub = np.full(n, 1.0 / n)
+        authority = hub
+        for _ in range(max_iter):
+            authority = np.bincount(targets, weights=hub[sources], minlength=n)
+            total = authority.sum()
+            if total:
+                authority /= total
+            new_hub = np.bincount(sources, weights=authority[targets], minlength=n)
+            total = new_hub.sum()
+            if total:
+                new_hub /= total
+            delta = np.abs(new_hub - hub).sum()
+            hub = new_hub
+            if delta < tol:
+                break
+        return hub.tolist(), authority.tolist()
+
+    sources, targets = graph.edge_arrays()
+    hub = [1.0 / n] * n
+    authority = hub
+    for _ in range(max_iter):
+        authority = [0.0] * n
+        for source, target in zip(sources, targets):
+            authority[target] += hub[source]
+        total = sum(authority)
+        if total:
+            authority = [value / total for value in authority]
+        new_hub = [0.0] * n
+        for source, target in zip(sources, targets):
+            new_hub[source] += authority[target]
+        total = sum(new_hub)
+        if total:
+            new_hub = [value / total for value in new_hub]
+        delta = sum(abs(a - b) for a, b in zip(new_hub, hub))
+        hub = new_hub
+        if delta < tol:
+            break
+    return hub, authority
+
+
+def core_numbers(graph: LinkGraph) -> List[int]:
+    """Return the k-core number of every node, treating links as undirected.
+
+    Self-links are ignored and a pair of notes linking both ways counts as
+    one undirected edge.
+    """
+    n = graph.num_nodes
+    if n == 0:
+        return []
+
+    # Batagelj-Zaversnik bucket peeling, O(nodes + edges) however deep the graph
+    indptr, indices = undirected_csr(graph)
+    degree = [indptr[node + 1] - indptr[node] for node in range(n)]
+
+    max_degree = max(degree)
+    bins = [0] * (max_degree + 1)
+    for d in degree:
+        bins[d] += 1
+    start = 0
+    for d in range(max_degree + 1):
+        bins[d], start = start, start + bins[d]
+
+    position = [0] * n
+    order = [0] * n
+    for node in range(n):
+        position[node] = bins[degree[node]]
+        order[position[node]] = node
+        bins[degree[node]] += 1
+    for d in range(max_degree, 0, -1):
+        bins[d] = bins[d - 1]
+    bins[0] = 0
+
+    for i in range(n):
+        node = order[i]
+        for other in indices[indptr[node]:indptr[node + 1]]:
+            if degree[other] > degree[node]:
+                d = degree[other]
+                first = order[bins[d]]
+                if first != other:
+                    position[other], position[first] = bins[d], position[other]
+                    order[position[first]], order[position[other]] = first, other
+                bins[d] += 1
+                degree[other] -= 1
+    return degree
+
+
+def personalized_pagerank(graph: LinkGraph, source: int, alpha: float = 0.15,
+                          epsilon: float = 1e-6) -> Tuple[Dict[int, float], Set[int]]:
+    """Approximate PageRank personalized to one node with the local push algorithm.
+
+    Links are followed in both directions. Residual mass is only pushed
+    out of nodes whose residual exceeds ``epsilon`` times their degree, so
+    the work depends on the source's neighbourhood rather than the graph
+    size. Returns (scores, touched) where touched holds every node the
+    push read, i.e. the nodes whose links the result depends on.
+    """
+    def degree(node):
+        return graph.out_degree(node) + graph.in_degree(node)
+
+    scores = {}
+    residual = {source: 1.0}
+    queue = deque([source])
+    queued = {source}
+
+    while queue:
+        node = queue.popleft()
+        queued.discard(node)
+        mass = residual[node]
+        node_degree = degree(node)
+        if node_degree == 0:
+            scores[node] = scores.get(node, 0.0) + mass
+            residual[node] = 0.0
+            continue
+        if mass < epsilon * node_degree:
+            continue
+
+        scores[node] = scores.get(node, 0.0) + alpha * mass
+        residual[node] = 0.0
+        share = (1.0 - alpha) * mass / node_degree
+        for neighbours in (graph.successors(node), graph.predecessors(node)):
+            for other in neighbours:
+                residual[other] = residual.get(other, 0.0) + share
+                if other not in queued and residual[other] >= epsilon * degree(other):
+                    queued.add(other)
+                    queue.append(other)
+
+    return scores, set(residual)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Structural analysis of a `LinkGraph` in linear time.
+
+- Weakly connected components via union-find
+- Strongly connected components via iterative Tarjan
+- Bridge links and articulation notes via iterative low-link DFS on the
+  undirected view of the graph
+- Communities via label propagation over array-based adjacency
+- Link counts between node groups (e.g. folders) as a block matrix
+
+All traversals use explicit stacks, so deep link chains cannot hit the
+recursion limit.
+"""
+
+import random
+from array import array
+from typing import List, Sequence, Set, Tuple
+
+from link_graph import INDEX_TYPECODE, LinkGraph
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to pure Python
+    np = None
+
+
+def weakly_connected_components(graph: LinkGraph) -> List[int]:
+    """Return a component label per node, ignoring link direction."""
+    parent = list(range(graph.num_nodes))
+    size = [1] * graph.num_nodes
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for source, target in graph.edges():
+        a, b = find(source), find(target)
+        if a == b:
+            continue
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+
+    return [find(node) for node in range(graph.num_nodes)]
+
+
+def strongly_connected_components(graph: LinkGraph) -> List[int]:
+    """Return a component label per node using an iterative Tarjan search."""
+    n = graph.num_nodes
+    indptr, indices = graph.indptr, graph.indices
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    labels = [-1] * n
+    stack = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, indptr[root])]
+
+        while work:
+            node, i = work[-1]
+            if i < indptr[node + 1]:
+                work[-1] = (node, i + 1)
+                other = indices[i]
+                if index[other] == -1:
+                    index[other] = low[other] = counter
+                    counter += 1
+                    stack.append(other)
+                    on_stack[other] = True
+                    work.append((other, indptr[other]))
+                elif on_stack[other] and index[other] < low[node]:
+                    low[node] = index[other]
+                continue
+
+            work.pop()
+            if work:
+                caller = work[-1][0]
+                if low[node] < low[caller]:
+                    low[caller] = low[node]
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    labels[member] = node
+                    if member == node:
+                        break
+
+    return labels
+
+
+def undirected_adjacency(graph: LinkGraph) -> List[List[int]]:
+    """Return sorted neighbour lists of the simple undirected view (no self-links)."""
+    neighbours = [set() for _ in range(graph.num_nodes)]
+    for source, target in graph.edges():
+        if source != target:
+            neighbours[source].add(target)
+            neighbours[target].add(source)
+    return [sorted(adjacent) for adjacent in neighbours]
+
+
+def undirected_csr(graph: LinkGraph) -> Tuple[array, array]:
+    """Return (indptr, indices) of the simple undirected view (no self-links)."""
+    indptr = array(INDEX_TYPECODE, [0])
+    indices = array(INDEX_TYPECODE)
+    for node in range(graph.num_nodes):
+        merged = set(graph.successors(node))
+        merged.update(graph.predecessors(node))
+        merged.discard(node)
+        indices.extend(sorted(merged))
+        indptr.append(len(indices))
+    return indptr, indices
+
+
+def bridges_and_articulation_points(graph: LinkGraph) -> Tuple[List[Tuple[int, int]], Set[int]]:
+    """Return (bridges, articulation points) of the undirected view of the graph.
+
+    A bridge is a connection whose removal disconnects its component; an
+    articulation point is a node whose removal does.
+    """
+    adjacency = undirected_adjacency(graph)
+    n = graph.num_nodes
+    discovered = [-1] * n
+    low = [0] * n
+    bridges = []
+    articulation = set()
+    counter = 0
+
+    for root in range(n):
+        if discovered[root] != -1:
+            continue
+        discovered[root] = low[root] = counter
+        counter += 1
+        root_children = 0
+        work = [(root, -1, 0)]
+
+        while work:
+            node, parent, i = work[-1]
+            if i < len(adjacency[node]):
+                work[-1] = (node, parent, i + 1)
+                other = adjacency[node][i]
+                if discovered[other] == -1:
+                    discovered[other] = low[other] = counter
+                    counter += 1
+                    work.append((other, node, 0))
+                    if node == root:
+                        root_children += 1
+                elif other != parent and discovered[other] < low[node]:
+                    low[node] = discovered[other]
+                continue
+
+            work.pop()
+            if parent == -1:
+                continue
+            if low[node] < low[parent]:
+                low[parent] = low[node]
+            if low[node] > discovered[parent]:
+                bridges.append((parent, node))
+            if parent != root and low[node] >= discovered[parent]:
+                articulation.add(parent)
+
+        if root_children > 1:
+            articulation.add(root)
+
+    return bridges, articulation
+
+
+def label_propagation(graph: LinkGraph, max_iter: int = 50, seed: int = 0) -> List[int]:
+    """Return a community label per node using asynchronous label propagation.
+
+    Every node repeatedly adopts the label most common among its
+    neighbours (ties broken at random with a fixed seed) until no label
+    changes. Each sweep is linear in the number of links. Isolated nodes
+    keep their own label.
+    """
+    indptr, indices = undirected_csr(graph)
+    n = graph.num_nodes
+    labels = list(range(n))
+    order = list(range(n))
+    rng = random.Random(seed)
+
+    for _ in range(max_iter):
+        rng.shuffle(order)
+        changed = False
+        for node in order:
+            start, end = indptr[node], indptr[node + 1]
+            if start == end:
+                continue
+            counts = {}
+            for i in range(start, end):
+                label = labels[indices[i]]
+                counts[label] = counts.get(label, 0) + 1
+            best = max(counts.values())
+            if counts.get(labels[node]) == best:
+                continue
+            labels[node] = rng.choice(sorted(label for label, count in counts.items() if count == best))
+            changed = True
+        if not changed:
+            break
+
+    return labels
+
+
+def block_connectivity(graph: LinkGraph, groups: Sequence[int], num_groups: int) -> List[List[int]]:
+    """Return matrix[a][b], the number of links from nodes of group a to nodes of group b.
+
+    One pass over the edge arrays; with NumPy it is a single bincount over
+    the flattened (source group, target group) block index.
+    """
+    sources, targets = graph.edge_arrays()
+    if np is not None:
+        group_ids = np.asarray(groups, dtype=np.int64)
+        blocks = (group_ids[np.frombuffer(sources, dtype=np.intc)] * num_groups
+                  + group_ids[np.frombuffer(targets, dtype=np.intc)])
+        counts = np.bincount(blocks, minlength=num_groups * num_groups)
+        return counts.reshape(num_groups, num_groups).tolist()
+
+    matrix = [[0] * num_groups for _ in range(num_groups)]
+    for source, target in zip(sources, targets):
+        matrix[groups[source]][groups[target]] += 1
+    return matrix
+
+
+def group_labels(labels: List[int]) -> List[List[int]]:
+    """Turn per-node labels into member lists, largest group first."""
+    groups = {}
+    for node, label in enumerate(labels):
+        groups.setdefault(label, []).append(node)
+    return sorted(groups.values(), key=lambda members: (-len(members), members[0]))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Multi-keyword matching with an Aho-Corasick automaton.
+
+Used by both `generate_links.py` (concept detection) and `extract_docs.py`
+(tag detection) so that every keyword is found in a single pass over a note
+instead of one substring search per keyword.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed set of keywords.
+
+    Matching is case-insensitive unless ``case_sensitive`` is set. With
+    ``word_boundaries`` enabled a match only counts if it is not directly
+    preceded or followed by a letter, digit or underscore, so "CAM" no
+    longer matches inside "became".
+    """
+
+    def __init__(self, keywords: Iterable[str], case_sensitive: bool = False, word_boundaries: bool = False):
+        self.case_sensitive = case_sensitive
+        self.word_boundaries = word_boundaries
+        self.keywords = []  # pattern id -> keyword as given
+        self._lengths = []  # pattern id -> length of the normalized pattern
+
+        # State 0 is the root; each state has goto edges, a fail link and outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        seen = {}
+        for keyword in keywords:
+            pattern = self._normalize(keyword)
+            if not pattern or pattern in seen:
+                continue
+            seen[pattern] = len(self.keywords)
+            self._add(pattern, len(self.keywords))
+            self.keywords.append(keyword)
+            self._lengths.append(len(pattern))
+
+        self._build_fail_links()
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _add(self, pattern: str, pattern_id: int):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] = self._out[state] + (pattern_id,)
+
+    def _build_fail_links(self):
+        # Breadth-first so every fail target is finished before it is used
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _scan_text(self, text: str, lowered: Optional[str] = None) -> str:
+        """Return the text to walk, with offsets that line up with the original."""
+        if self.case_sensitive:
+            return text
+        if lowered is None:
+            lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        # A few characters lowercase to several; fold per character instead
+        return ''.join(ch.lower()[0] for ch in text)
+
+    def finditer(self, text: str, lowered: Optional[str] = None) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, keyword) for every match, ordered by end offset.
+
+        Callers that already hold ``text.lower()`` can pass it as ``lowered``
+        to avoid lowercasing the text again.
+        """
+        if not self.keywords:
+            return
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        scan = self._scan_text(text, lowered)
+        state = 0
+        for i, ch in enumerate(scan):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for pattern_id in out[state]:
+                start = end - lengths[pattern_id]
+                if self.word_boundaries and not self._at_boundary(text, start, end):
+                    continue
+                yield start, end, self.keywords[pattern_id]
+
+    @staticmethod
+    def _at_boundary(text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+            return False
+        if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+            return False
+        return True
+
+    def find_keywords(self, text: str, lowered: Optional[str] = None) -> Set[str]:
+        """Return the set of keywords that occur in the text."""
+        return {keyword for _, _, keyword in self.finditer(text, lowered)}
+
+    def count_keywords(self, text: str, lowered: Optional[str] = None) -> Dict[str, int]:
+        """Return how often each occurring keyword appears in the text."""
+        counts = {}
+        for _, _, keyword in self.finditer(text, lowered):
+            counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
+
+
+@lru_cache(maxsize=32)
+def _compile(keywords: Tuple[str, ...], case_sensitive: bool, word_boundaries: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, case_sensitive=case_sensitive, word_boundaries=word_boundaries)
+
+
+def compile_matcher(keywords: Iterable[str], case_sensitive: bool = False, word_boundaries: bool = False) -> KeywordMatcher:
+    """Return a matcher for the keywords, reusing a cached automaton when possible."""
+    return _compile(tuple(keywords), case_sensitive, word_boundaries)
+
+
+def concept_keywords(key_concepts: Dict[str, List[str]]) -> List[str]:
+    """Flatten a concept -> keywords mapping into a keyword list in definition order."""
+    return [keyword for keywords in key_concepts.values() for keyword in keywords]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Array-backed link graph for the knowledge graph scripts.
+
+Nodes are integer IDs. Edges are stored in compressed sparse row (CSR)
+form twice, once by source (forward links) and once by target (backlinks),
+using ``array`` buffers instead of per-node sets. Each row is sorted and
+deduplicated, so membership checks are a binary search.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Tuple
+
+INDEX_TYPECODE = 'i'
+
+
+def _build_csr(num_nodes: int, rows: array, cols: array) -> Tuple[array, array]:
+    """Build (indptr, indices) with sorted, unique column IDs per row."""
+    counts = [0] * (num_nodes + 1)
+    for row in rows:
+        counts[row + 1] += 1
+    for i in range(num_nodes):
+        counts[i + 1] += counts[i]
+
+    # Counting sort of the column IDs into their rows
+    scattered = array(INDEX_TYPECODE, bytes(len(cols) * array(INDEX_TYPECODE).itemsize))
+    fill = counts[:-1]
+    for row, col in zip(rows, cols):
+        scattered[fill[row]] = col
+        fill[row] += 1
+
+    indptr = array(INDEX_TYPECODE, [0])
+    indices = array(INDEX_TYPECODE)
+    for row in range(num_nodes):
+        unique = sorted(set(scattered[counts[row]:counts[row + 1]]))
+        indices.extend(unique)
+        indptr.append(len(indices))
+    return indptr, indices
+
+
+class LinkGraph:
+    """Directed graph in CSR form with forward and reverse adjacency."""
+
+    def __init__(self, num_nodes: int, sources: Iterable[int], targets: Iterable[int]):
+        sources = array(INDEX_TYPECODE, sources)
+        targets = array(INDEX_TYPECODE, targets)
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets must have the same length")
+
+        self.num_nodes = num_nodes
+        self.indptr, self.indices = _build_csr(num_nodes, sources, targets)
+        self.rindptr, self.rindices = _build_csr(num_nodes, targets, sources)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def successors(self, node: int) -> array:
+        """Sorted IDs of the nodes this node links to."""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def predecessors(self, node: int) -> array:
+        """Sorted IDs of the nodes linking to this node."""
+        return self.rindices[self.rindptr[node]:self.rindptr[node + 1]]
+
+    def out_degree(self, node: int) -> int:
+        return self.indptr[node + 1] - self.indptr[node]
+
+    def in_degree(self, node: int) -> int:
+        return self.rindptr[node + 1] - self.rindptr[node]
+
+    def has_edge(self, source: int, target: int) -> bool:
+        """Binary search the source's sorted row for the target."""
+        lo, hi = self.indptr[source], self.indptr[source + 1]
+        i = bisect_left(self.indices, target, lo, hi)
+        return i < hi and self.indices[i] == target
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """Yield (source, target) pairs in row order."""
+        indptr, indices = self.indptr, self.indices
+        for source in range(self.num_nodes):
+            for i in range(indptr[source], indptr[source + 1]):
+                yield source, indices[i]
+
+    def truncated(self, num_nodes: int) -> 'LinkGraph':
+        """Return the subgraph induced by the node IDs below num_nodes."""
+        sources = array(INDEX_TYPECODE)
+        targets = array(INDEX_TYPECODE)
+        for source in range(min(num_nodes, self.num_nodes)):
+            for target in self.successors(source):
+                if target < num_nodes:
+                    sources.append(source)
+                    targets.append(target)
+        return LinkGraph(num_nodes, sources, targets)
+
+    def edge_arrays(self) -> Tuple[array, array]:
+        """Return parallel (sources, targets) arrays in row order."""
+        sources = array(INDEX_TYPECODE)
+        for source in range(self.num_nodes):
+            sources.extend([source] * self.out_degree(source))
+        return sources, self.indices
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Obsidian-style resolution of wiki link targets to note IDs.
+
+Obsidian matches link text case-insensitively against file names, path
+suffixes (``Folder/Note``) and frontmatter aliases, ignores a trailing
+``.md`` and treats everything after ``#`` as a heading or ``^block``
+anchor inside the note. `LinkResolver` keeps one dict per form, so
+resolving a link is a constant number of lookups. When several notes
+share a name, the one in the linking note's folder wins, then the one with
+the shortest path.
+"""
+
+from bisect import insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NOTE_SUFFIX = '.md'
+
+
+def split_target(target: str) -> Tuple[str, str]:
+    """Split ``Note#Heading`` into ('Note', 'Heading'); the anchor is '' when absent."""
+    name, _, anchor = target.partition('#')
+    return name.strip(), anchor.strip()
+
+
+def normalize_key(name: str) -> str:
+    """Case-fold a link name or path and drop leading ``./``, ``/`` and a trailing ``.md``."""
+    key = name.strip().replace('\\', '/').casefold()
+    while key.startswith('./'):
+        key = key[2:]
+    key = key.lstrip('/')
+    if key.endswith(NOTE_SUFFIX):
+        key = key[:-len(NOTE_SUFFIX)]
+    return key
+
+
+def is_note_target(name: str) -> bool:
+    """True for targets naming a note rather than an attachment such as ``image.png``."""
+    _, dot, extension = name.rsplit('/', 1)[-1].rpartition('.')
+    if not dot or extension.casefold() == NOTE_SUFFIX[1:]:
+        return True
+    # 'v1.2 notes' is a note name, 'diagram.png' is an attachment
+    return not (extension.isalnum() and len(extension) <= 5)
+
+
+class LinkResolver:
+    """Index of every name a note can be linked by."""
+
+    def __init__(self):
+        self.by_name: Dict[str, List[Tuple]] = {}  # case-folded file name -> candidates
+        self.by_path: Dict[str, List[Tuple]] = {}  # case-folded path suffix 'folder/note' -> candidates
+        self.by_alias: Dict[str, List[Tuple]] = {}  # case-folded frontmatter alias -> candidates
+        self.folders: Dict[int, str] = {}  # note ID -> case-folded folder
+
+    def add(self, note_id: int, relative: str, aliases: Iterable[str] = ()):
+        """Register a note under its file name, path suffixes and aliases."""
+        key = normalize_key(relative)
+        parts = key.split('/')
+        folder = '/'.join(parts[:-1])
+        self.folders[note_id] = folder
+        # Candidates sort by path depth, then path, so the first is Obsidian's pick
+        candidate = (len(parts), key, note_id)
+
+        insort(self.by_name.setdefault(parts[-1], []), candidate)
+        for i in range(len(parts) - 1):
+            insort(self.by_path.setdefault('/'.join(parts[i:]), []), candidate)
+        for alias in aliases:
+            insort(self.by_alias.setdefault(normalize_key(alias), []), candidate)
+
+    def resolve(self, target: str, source: Optional[int] = None) -> Optional[int]:
+        """Return the note ID a link target points at, or None if nothing matches.
+
+        The target may carry an anchor (``Note#Heading``); an anchor-only
+        target (``#Heading``) points at the source note itself.
+        """
+        name, _ = split_target(target)
+        if not name:
+            return source
+        key = normalize_key(name)
+        if '/' in key:
+            candidates = self.by_path.get(key)
+        else:
+            candidates = self.by_name.get(key) or self.by_alias.get(key)
+        if not candidates:
+            return None
+        if len(candidates) > 1 and source is not None:
+            folder = self.folders.get(source)
+            for _, candidate_key, note_id in candidates:
+                if candidate_key.rpartition('/')[0] == folder:
+                    return note_id
+        return candidates[0][2]
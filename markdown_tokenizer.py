@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Single-pass tokenizer for the Obsidian markdown used in the vault.
+
+`tokenize` walks a note once, line by line, tracking YAML frontmatter,
+fenced code blocks and inline code spans, and yields typed tokens with
+character offsets:
+
+- ``wiki_link``: ``[[Target#Anchor|Label]]``
+- ``embed``: ``![[Target]]``
+- ``markdown_link``: ``[Label](target)``
+- ``image``: ``![Alt](source)``
+- ``heading``: ``## Title``
+- ``tag``: ``#tag`` or ``#nested/tag``
+- ``block_id``: a trailing ``^block-id``
+- ``code``: a fenced block or inline code span
+- ``frontmatter``: the leading ``---`` block
+
+Nothing inside frontmatter or code is reported as a link, heading or tag,
+so snippets like ```` `[[Note]]` ```` no longer count as real links.
+"""
+
+import re
+from typing import Iterable, Iterator, List, Optional
+
+WIKI_LINK = 'wiki_link'
+EMBED = 'embed'
+MARKDOWN_LINK = 'markdown_link'
+IMAGE = 'image'
+HEADING = 'heading'
+TAG = 'tag'
+BLOCK_ID = 'block_id'
+CODE = 'code'
+FRONTMATTER = 'frontmatter'
+
+LINK_KINDS = frozenset((WIKI_LINK, EMBED, MARKDOWN_LINK, IMAGE))
+
+# Characters that can start a token; everything between them is plain text
+SPECIAL_PATTERN = re.compile(r'[`\[!#^\\]')
+FENCE_PATTERN = re.compile(r'[ \t]{0,3}(`{3,}|~{3,})')
+HEADING_PATTERN = re.compile(r'(#{1,6})[ \t]+(.*?)[ \t#]*$|(#{1,6})$')
+TAG_PATTERN = re.compile(r'#([\w/-]*[^\W\d][\w/-]*)')
+BLOCK_ID_PATTERN = re.compile(r'\^([A-Za-z0-9-]+)[ \t]*$')
+
+
+class Token:
+    """A typed span of a note. ``target`` and ``label`` depend on the kind.
+
+    Links carry their target and optional label (alias or link text),
+    headings their title and level, tags and block IDs their name.
+    """
+
+    __slots__ = ('kind', 'start', 'end', 'target', 'label', 'level')
+
+    def __init__(self, kind: str, start: int, end: int, target: str = '',
+                 label: Optional[str] = None, level: int = 0):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.target = target
+        self.label = label
+        self.level = level
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.start}, {self.end}, {self.target!r})"
+
+
+def _frontmatter_end(content: str) -> int:
+    """Return the offset just past a leading frontmatter block, or 0.
+
+    Lines may end in ``\n`` or ``\r\n``.
+    """
+    if not content.startswith(('---\n', '---\r\n')):
+        return 0
+    close = content.find('\n---', 3)
+    while close != -1:
+        after = close + 4
+        if content.startswith('\r\n', after):
+            return after + 2
+        if content[after:after + 1] in ('', '\n') or content[after:] == '\r':
+            return min(after + 1, len(content))
+        close = content.find('\n---', after)
+    return 0
+
+
+def _inline(line: str, base: int, tokens: List[Token]):
+    """Append the inline tokens of one line of text starting at offset base."""
+    i = 0
+    length = len(line)
+    while True:
+        match = SPECIAL_PATTERN.search(line, i)
+        if not match:
+            return
+        i = match.start()
+        char = line[i]
+
+        if char == '\\':
+            i += 2  # escaped character
+            continue
+
+        if char == '`':
+            run = i
+            while run < length and line[run] == '`':
+                run += 1
+            close = line.find(line[i:run], run)
+            while close != -1 and close + (run - i) < length and line[close + run - i] == '`':
+                close = line.find(line[i:run], close + run - i + 1)
+            if close == -1:
+                i = run
+                continue
+            end = close + run - i
+            tokens.append(Token(CODE, base + i, base + end))
+            i = end
+            continue
+
+        if char == '!' or char == '[':
+            embed = char == '!'
+            opening = i + 1 if embed else i
+            if line.startswith('[[', opening):
+                close = line.find(']]', opening + 2)
+                inner = line[opening + 2:close] if close != -1 else ''
+                target, _, label = inner.partition('|')
+                if close != -1 and target and ']' not in target:
+                    tokens.append(Token(EMBED if embed else WIKI_LINK, base + i, base + close + 2,
+                                        target, label or None))
+                    i = close + 2
+                    continue
+            elif line.startswith('[', opening):
+                close = line.find(']', opening + 1)
+                if close != -1 and close > opening + 1 and line.startswith('(', close + 1):
+                    end = line.find(')', close + 2)
+                    target = line[close + 2:end].strip() if end != -1 else ''
+                    if target:
+                        # Drop an optional "title" and <angle brackets>
+                        target = target.split(None, 1)[0].strip('<>')
+                        tokens.append(Token(IMAGE if embed else MARKDOWN_LINK, base + i, base + end + 1,
+                                            target, line[opening + 1:close]))
+                        i = end + 1
+                        continue
+            i += 1
+            continue
+
+        if char == '#':
+            if i == 0 or line[i - 1].isspace():
+                tag = TAG_PATTERN.match(line, i)
+                if tag:
+                    tokens.append(Token(TAG, base + i, base + tag.end(), tag.group(1)))
+                    i = tag.end()
+                    continue
+            i += 1
+            continue
+
+        # char == '^'
+        if i == 0 or line[i - 1].isspace():
+            block = BLOCK_ID_PATTERN.match(line, i)
+            if block:
+                tokens.append(Token(BLOCK_ID, base + i, base + block.end(), block.group(1)))
+                return
+        i += 1
+
+
+def tokenize(content: str) -> Iterator[Token]:
+    """Yield the tokens of a note in document order."""
+    position = _frontmatter_end(content)
+    if position:
+        yield Token(FRONTMATTER, 0, position)
+
+    fence = None
+    fence_start = 0
+    for line in content[position:].splitlines(keepends=True):
+        start = position
+        position += len(line)
+        text = line.rstrip('\r\n')
+
+        marker = FENCE_PATTERN.match(text)
+        if fence is not None:
+            if marker and marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence) \
+                    and not text[marker.end():].strip():
+                fence = None
+                yield Token(CODE, fence_start, start + len(text))
+            continue
+        if marker and not (marker.group(1)[0] == '`' and '`' in text[marker.end():]):
+            fence = marker.group(1)
+            fence_start = start
+            continue
+
+        tokens = []
+        if text.startswith('#'):
+            heading = HEADING_PATTERN.match(text)
+            if heading:
+                hashes = heading.group(1) or heading.group(3)
+                title = heading.group(2) or ''
+                tokens.append(Token(HEADING, start, start + len(text), title, level=len(hashes)))
+                _inline(text[len(hashes):], start + len(hashes), tokens)
+                yield from tokens
+                continue
+        _inline(text, start, tokens)
+        yield from tokens
+
+    if fence is not None:
+        # An unclosed fence runs to the end of the note
+        yield Token(CODE, fence_start, len(content))
+
+
+def protected_spans(tokens: Iterable[Token]) -> List[Token]:
+    """Return the link, code and frontmatter tokens, the spans text rewrites must leave alone."""
+    return [token for token in tokens if token.kind in LINK_KINDS or token.kind in (CODE, FRONTMATTER)]
+
+
+def byte_offsets(content: str, offsets: Iterable[int]) -> List[int]:
+    """Convert ascending character offsets into UTF-8 byte offsets in one pass."""
+    result = []
+    previous = total = 0
+    for offset in offsets:
+        total += len(content[previous:offset].encode('utf-8'))
+        previous = offset
+        result.append(total)
+    return result
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Single-pass analyzer framework for vault notes.
+
+An analyzer subclasses `NoteAnalyzer`, lists the token kinds it wants in
+``kinds`` and overrides any of the hooks. `AnalyzerPass` tokenizes each
+note exactly once and dispatches every token only to the analyzers that
+asked for its kind, so adding an analysis adds no extra reads or
+tokenizer passes:
+
+    class TodoCounter(NoteAnalyzer):
+        kinds = (TAG,)
+
+        def begin(self, generator):
+            self.todo_notes = set()
+
+        def visit(self, note, token):
+            if token.target == 'todo':
+                self.todo_notes.add(note.name)
+
+    generator.register_analyzer(TodoCounter())
+
+Hooks run in this order: ``begin`` once, then per note ``start_note``,
+``visit`` for each wanted token and ``end_note``, then ``finish`` once.
+
+Given a `ParseCache`, the pass reads each note's tokens from the cache
+instead of tokenizing it. An analyzer that sets ``cache_field`` also has
+its per-note features cached: after ``end_note`` the pass stores what
+``save_note`` returns, and for a note seen before it calls ``load_note``
+with that data instead of ``end_note``. A field named ``'name:variant'``
+replaces any other variant of ``name`` cached for the same text, so
+features that depend on settings keep one copy per note.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from keyword_matcher import concept_keywords
+from markdown_tokenizer import (CODE, EMBED, FRONTMATTER, IMAGE, MARKDOWN_LINK, TAG, TAG_PATTERN, WIKI_LINK, Token,
+                                tokenize)
+from note_model import Note, frontmatter_list
+from parse_cache import ParseCache, content_key, pack_arrays, pack_strings, split_strings, unpack_arrays
+from text_similarity import MinHasher, TermCounts, content_digest, term_frequencies, terms, word_shingles
+
+
+class NoteAnalyzer:
+    """Base class for analyzers run by `AnalyzerPass`; every hook is optional."""
+
+    kinds: Sequence[str] = ()  # token kinds passed to visit()
+    cache_field: Optional[str] = None  # parse cache field for this analyzer's per-note features
+
+    def begin(self, generator):
+        """Called once before the first note."""
+
+    def start_note(self, note: Note):
+        """Called before the note's tokens."""
+
+    def visit(self, note: Note, token: Token):
+        """Called for each token of a kind listed in ``kinds``."""
+
+    def end_note(self, note: Note):
+        """Called after the note's last token."""
+
+    def save_note(self, note: Note) -> bytes:
+        """Return the features end_note just computed, packed for the parse cache."""
+        raise NotImplementedError
+
+    def load_note(self, note: Note, data: bytes):
+        """Called instead of end_note with the features save_note packed for the same text."""
+        raise NotImplementedError
+
+    def finish(self, generator):
+        """Called once after the last note."""
+
+
+class AnalyzerPass:
+    """Runs a set of analyzers over all notes in one tokenizer pass per note."""
+
+    def __init__(self, analyzers: Iterable[NoteAnalyzer], cache: Optional[ParseCache] = None):
+        self.analyzers = list(analyzers)
+        self.cache = cache
+        self.dispatch: Dict[str, List] = defaultdict(list)  # token kind -> visit hooks
+        for analyzer in self.analyzers:
+            for kind in analyzer.kinds:
+                self.dispatch[kind].append(analyzer.visit)
+
+    def run(self, generator, notes: Iterable[Note], tokens: Optional[Dict[int, List[Token]]] = None):
+        """Analyze all notes; for streaming, call begin, process and finish directly.
+
+        ``tokens`` maps note IDs to token lists already produced by the
+        scan; those notes are not tokenized again.
+        """
+        tokens = tokens or {}
+        self.begin(generator)
+        for note in notes:
+            self.process(note, tokens.get(note.id))
+        self.finish(generator)
+
+    def begin(self, generator):
+        for analyzer in self.analyzers:
+            analyzer.begin(generator)
+
+    def process(self, note: Note, tokens: Optional[List[Token]] = None):
+        """Feed one note to every analyzer.
+
+        The note is only tokenized when ``tokens`` is not given and the
+        cache, if any, has no tokens for its text.
+        """
+        cache = self.cache
+        key = content_key(note.content) if cache is not None else None
+        if tokens is None:
+            tokens = cache.tokens(note.content, key) if cache is not None else tokenize(note.content)
+        for analyzer in self.analyzers:
+            analyzer.start_note(note)
+        dispatch = self.dispatch
+        for token in tokens:
+            for visit in dispatch.get(token.kind, ()):
+                visit(note, token)
+        for analyzer in self.analyzers:
+            field = analyzer.cache_field if cache is not None else None
+            data = cache.get(key, field) if field else None
+            if data is not None:
+                analyzer.load_note(note, data)
+                continue
+            analyzer.end_note(note)
+            if field:
+                name, _, variant = field.partition(':')
+                cache.put(key, field, analyzer.save_note(note), replace_prefix=name + ':' if variant else None)
+
+    def finish(self, generator):
+        for analyzer in self.analyzers:
+            analyzer.finish(generator)
+
+
+class LinkAnalyzer(NoteAnalyzer):
+    """Builds the generator's link graph from the wiki links and embeds parsed by the scan.
+
+    Links are resolved at the end, once every note (and its aliases) is known.
+    """
+
+    def finish(self, generator):
+        generator.extract_existing_links()
+
+
+class TagAnalyzer(NoteAnalyzer):
+    """Builds the generator's index from tag to the notes using it.
+
+    Tags are inline ``#tags`` plus the frontmatter ``tags`` list, as in Obsidian.
+    """
+
+    kinds = (TAG,)
+
+    def begin(self, generator):
+        self.tag_index = defaultdict(set)
+
+    def visit(self, note, token):
+        self.tag_index[token.target.lower()].add(note.name)
+
+    def end_note(self, note):
+        for tag in frontmatter_list(note.frontmatter.get('tags', '')):
+            # Values that could not be written as an inline tag (such as links) are not tags
+            match = TAG_PATTERN.fullmatch('#' + tag.lstrip('#'))
+            if match:
+                self.tag_index[match.group(1).lower()].add(note.name)
+
+    def finish(self, generator):
+        generator.tag_index = dict(self.tag_index)
+
+
+class ConceptAnalyzer(NoteAnalyzer):
+    """Builds the generator's concept index and name-mention hits.
+
+    Mentions inside links, code and frontmatter are dropped using the spans
+    of the same token stream. Only concept hits are cached, keyed by the
+    keyword list; mention hits depend on every note name, so they are found
+    afresh on each run and adding a note does not invalidate the cache.
+    """
+
+    kinds = (WIKI_LINK, EMBED, MARKDOWN_LINK, IMAGE, CODE, FRONTMATTER)
+
+    def begin(self, generator):
+        self.keywords = concept_keywords(generator.key_concepts)
+        self.keyword_ids = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self.concepts = generator.concept_matcher()
+        generator.concept_index = {keyword.lower(): set() for keyword in self.keywords}
+        if generator.mention_matcher is None:
+            generator.build_mention_matcher()
+        self.cache_field = 'concepts:' + content_key('\n'.join(self.keywords)).hex()[:16]
+        generator.mention_hits = defaultdict(list)
+        self.generator = generator
+
+    def start_note(self, note):
+        self.span_starts, self.span_ends = [], []
+
+    def visit(self, note, token):
+        self.span_starts.append(token.start)
+        self.span_ends.append(token.end)
+
+    def end_note(self, note):
+        self.found = self.concepts.find_keywords(note.content, note.lower)
+        for keyword in self.found:
+            self.generator.concept_index[keyword.lower()].add(note.name)
+        self.find_mentions(note)
+
+    def save_note(self, note):
+        return pack_arrays(array('I', sorted(self.keyword_ids[keyword] for keyword in self.found)))
+
+    def load_note(self, note, data):
+        for keyword in unpack_arrays(data, 'I')[0]:
+            self.generator.concept_index[self.keywords[keyword].lower()].add(note.name)
+        self.find_mentions(note)
+
+    def find_mentions(self, note):
+        generator = self.generator
+        hits = generator.mention_hits[note.id]
+        for start, end, variation in generator.mention_matcher.finditer(note.content, note.lower):
+            i = bisect_right(self.span_starts, start) - 1
+            if i < 0 or start >= self.span_ends[i]:
+                hits.append((start, end, variation, note.content[start:end]))
+
+
+class DuplicateAnalyzer(NoteAnalyzer):
+    """Collects shingle sets and digests for near-duplicate detection."""
+
+    cache_field = 'shingles'
+
+    def begin(self, generator):
+        self.shingle_sets = []
+        self.digests = []
+
+    def end_note(self, note):
+        self.shingle_sets.append(word_shingles(note.words))
+        self.digests.append(content_digest(note.content))
+
+    def save_note(self, note):
+        # Shingles are CRC32 hashes
+        return pack_arrays(array('I', sorted(self.shingle_sets[-1])))
+
+    def load_note(self, note, data):
+        self.shingle_sets.append(set(unpack_arrays(data, 'I')[0]))
+        self.digests.append(content_digest(note.content))
+
+    def finish(self, generator):
+        generator.detect_near_duplicates(features=(self.shingle_sets, self.digests))
+
+
+class TermAnalyzer(NoteAnalyzer):
+    """Counts word terms per note and builds the generator's TF-IDF matrix from them.
+
+    Counts are kept as term IDs into one shared vocabulary, so memory grows
+    with the number of distinct terms per note, not with the vault's text.
+    """
+
+    cache_field = 'terms'
+
+    def begin(self, generator):
+        self.counts = TermCounts()
+
+    def end_note(self, note):
+        self.note_counts = term_frequencies(terms(note.words))
+        self.counts.add(self.note_counts)
+
+    def save_note(self, note):
+        counts = self.note_counts
+        return pack_strings(counts) + pack_arrays(array('I', counts.values()))
+
+    def load_note(self, note, data):
+        lengths, blob, counts = unpack_arrays(data, 'IBI')
+        self.counts.add(dict(zip(split_strings(lengths, blob), counts)))
+
+    def finish(self, generator):
+        generator.build_tfidf(term_counts=self.counts)
+
+
+class SignatureAnalyzer(NoteAnalyzer):
+    """Keeps a MinHash signature per note instead of its shingle set."""
+
+    cache_field = 'minhash'
+
+    def begin(self, generator):
+        self.hasher = MinHasher()
+        self.signatures = []
+        self.digests = []
+
+    def end_note(self, note):
+        shingle_set = word_shingles(note.words)
+        self.signatures.append(self.hasher.signature(shingle_set) if shingle_set else None)
+        self.digests.append(content_digest(note.content))
+
+    def save_note(self, note):
+        # An empty signature stands for a note without shingles
+        return pack_arrays(self.signatures[-1] or array('q'))
+
+    def load_note(self, note, data):
+        signature = unpack_arrays(data, 'q')[0]
+        self.signatures.append(signature or None)
+        self.digests.append(content_digest(note.content))
+
+    def finish(self, generator):
+        generator.detect_near_duplicates(signatures=(self.signatures, self.digests))
+
+
+def default_analyzers() -> List[NoteAnalyzer]:
+    """The analyzers `ObsidianLinkGenerator.analyze_notes` always runs."""
+    return [LinkAnalyzer(), TagAnalyzer(), ConceptAnalyzer(), DuplicateAnalyzer()]
+
+
+def streaming_analyzers() -> List[NoteAnalyzer]:
+    """Analyzers for streaming scans: every feature later phases need, none holding text."""
+    return [LinkAnalyzer(), TagAnalyzer(), ConceptAnalyzer(), TermAnalyzer(), SignatureAnalyzer()]
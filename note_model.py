@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory record for a vault note.
+
+`Note` uses ``__slots__`` and interned name strings so that tens of
+thousands of notes stay cheap to hold, and computes derived forms
+(lowercased text, word list, frontmatter) only once, on first use.
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from text_similarity import WORD_PATTERN
+
+FRONTMATTER_PATTERN = re.compile(r'\A---\r?\n(.*?)\r?\n---\r?\n', re.DOTALL)
+
+
+def parse_frontmatter(content: str) -> Dict[str, str]:
+    """Parse the simple ``key: value`` YAML frontmatter used in this vault.
+
+    Block lists (``- item`` lines under an empty key) are folded into the
+    inline ``[a, b]`` form.
+    """
+    match = FRONTMATTER_PATTERN.match(content)
+    if not match:
+        return {}
+
+    frontmatter = {}
+    items = None
+    for line in match.group(1).splitlines():
+        stripped = line.strip()
+        if items is not None and stripped.startswith('- '):
+            items.append(stripped[2:].strip())
+            frontmatter[key] = f"[{', '.join(items)}]"
+            continue
+        key, sep, value = line.partition(':')
+        if sep and key and not key[0].isspace():
+            key, value = key.strip(), value.strip()
+            frontmatter[key] = value
+            items = [] if not value else None
+    return frontmatter
+
+
+def frontmatter_list(value: str) -> List[str]:
+    """Split an inline ``[a, b]`` or ``a, b`` frontmatter value into items."""
+    value = value.strip()
+    if value.startswith('[') and value.endswith(']'):
+        value = value[1:-1]
+    return [item.strip().strip('"\'') for item in value.split(',') if item.strip().strip('"\'')]
+
+
+class Note:
+    """A scanned note with lazily cached derived forms."""
+
+    __slots__ = ('id', 'name', 'relative', 'content', 'links', 'embeds', 'sections',
+                 '_lower', '_words', '_frontmatter')
+
+    def __init__(self, note_id: int, name: str, relative: str, content: str, links: List[str],
+                 embeds: List[str] = (), sections=None):
+        self.id = note_id
+        self.name = sys.intern(name)
+        self.relative = relative  # POSIX-style path relative to the vault root
+        self.content = content
+        self.links = [sys.intern(link) for link in links]  # [[target]] wiki links
+        self.embeds = [sys.intern(embed) for embed in embeds]  # ![[target]] embeds
+        self.sections = sections  # SectionIndex of headings and ^block IDs, if parsed
+        self._lower = None
+        self._words = None
+        self._frontmatter = None
+
+    @property
+    def path(self) -> Path:
+        return Path(self.relative)
+
+    @property
+    def lower(self) -> str:
+        """Lowercased content."""
+        if self._lower is None:
+            self._lower = self.content.lower()
+        return self._lower
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        """Lowercased words, shared by TF-IDF terms and near-duplicate shingles."""
+        if self._words is None:
+            self._words = tuple(WORD_PATTERN.findall(self.lower))
+        return self._words
+
+    @property
+    def frontmatter(self) -> Dict[str, str]:
+        """Parsed frontmatter fields, empty if the note has none."""
+        if self._frontmatter is None:
+            self._frontmatter = parse_frontmatter(self.content)
+        return self._frontmatter
+
+    @property
+    def stem(self) -> str:
+        """File name without the .md extension."""
+        return self.path.stem
+
+    @property
+    def aliases(self) -> List[str]:
+        """Alternative link names from the ``aliases`` frontmatter field."""
+        return frontmatter_list(self.frontmatter.get('aliases', ''))
+
+    def release_content(self):
+        """Drop the text once its features are extracted, keeping the parsed frontmatter."""
+        if self._frontmatter is None:
+            self._frontmatter = parse_frontmatter(self.content)
+        self.content = None
+        self._lower = self._words = None
+
+    def __repr__(self):
+        return f"Note({self.id}, {self.name!r})"
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache of per-note parse results.
+
+Entries are keyed by the SHA-1 of a note's text rather than its path, so a
+note is parsed once however many tools read it, and renamed or copied
+notes hit the cache too. Each entry holds named binary fields: the markdown
+token stream plus per-note analyzer features such as concept hits, shingles
+or MinHash signatures, packed as ``array`` buffers.
+
+The cache is a single binary file:
+
+    header   b'NPC1', version (uint32), generation (uint32)
+    entry    digest (20 bytes), last used generation (uint32), field count (uint16)
+    field    name length (uint16), name, data length (uint32), data
+
+Every load starts a new generation; on save, entries not used for the
+most generations are dropped until the file fits in ``max_bytes``. A run
+that only reads from the cache does not rewrite it. Arrays are stored
+in native byte order, so a cache file belongs to one machine.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from markdown_tokenizer import (BLOCK_ID, CODE, EMBED, FRONTMATTER, HEADING, IMAGE, MARKDOWN_LINK, TAG,
+                                WIKI_LINK, Token, tokenize)
+
+MAGIC = b'NPC1'
+HEADER = struct.Struct('<4sII')
+ENTRY = struct.Struct('<20sIH')
+FIELD_NAME = struct.Struct('<H')
+LENGTH = struct.Struct('<I')
+
+TOKENS_FIELD = 'tokens'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Token kinds by their one-byte code; append only, or bump ParseCache.VERSION
+KINDS = (WIKI_LINK, EMBED, MARKDOWN_LINK, IMAGE, HEADING, TAG, BLOCK_ID, CODE, FRONTMATTER)
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+
+def content_key(content: str) -> bytes:
+    """Return the cache key of a note's text."""
+    return hashlib.sha1(content.encode('utf-8')).digest()
+
+
+def pack_arrays(*arrays: array) -> bytes:
+    """Concatenate arrays into one field, each prefixed with its byte length."""
+    parts = []
+    for values in arrays:
+        data = values.tobytes()
+        parts.append(LENGTH.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def unpack_arrays(data: bytes, typecodes: str) -> List[array]:
+    """Split a field written by `pack_arrays` back into arrays of the given typecodes."""
+    arrays = []
+    position = 0
+    for typecode in typecodes:
+        (length,) = LENGTH.unpack_from(data, position)
+        position += LENGTH.size
+        values = array(typecode)
+        values.frombytes(data[position:position + length])
+        position += length
+        arrays.append(values)
+    return arrays
+
+
+def pack_strings(strings: Iterable[str]) -> bytes:
+    """Pack strings as their UTF-8 byte lengths followed by the joined bytes."""
+    encoded = [string.encode('utf-8') for string in strings]
+    return pack_arrays(array('I', map(len, encoded)), array('B', b''.join(encoded)))
+
+
+def split_strings(lengths: Sequence[int], blob: array) -> List[str]:
+    """Decode the two arrays written by `pack_strings` back into strings."""
+    blob = blob.tobytes()
+    strings = []
+    position = 0
+    for length in lengths:
+        strings.append(blob[position:position + length].decode('utf-8'))
+        position += length
+    return strings
+
+
+def encode_tokens(tokens: Sequence[Token]) -> bytes:
+    """Pack a token stream; missing labels are stored as '' since real labels are never empty."""
+    kinds = array('B', (KIND_CODES[token.kind] for token in tokens))
+    levels = array('B', (token.level for token in tokens))
+    positions = array('I')
+    texts = []
+    for token in tokens:
+        positions.append(token.start)
+        positions.append(token.end)
+        texts.append(token.target)
+        texts.append(token.label or '')
+    return pack_arrays(kinds, levels, positions) + pack_strings(texts)
+
+
+def decode_tokens(data: bytes) -> List[Token]:
+    kinds, levels, positions, lengths, blob = unpack_arrays(data, 'BBIIB')
+    texts = split_strings(lengths, blob)
+    return [
+        Token(KINDS[kind], positions[2 * i], positions[2 * i + 1], texts[2 * i], texts[2 * i + 1] or None, level)
+        for i, (kind, level) in enumerate(zip(kinds, levels))
+    ]
+
+
+class ParseCache:
+    """Persistent map from note content hash to named binary parse results.
+
+    `get`, `put` and `tokens` may be called from several threads at once.
+    """
+
+    VERSION = 2
+
+    def __init__(self, cache_path: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self.entries: Dict[bytes, List] = {}  # content hash -> [last used generation, {field: data}]
+        self.generation = 0
+        self.loaded = False
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # guards entries, dirty and the hit counters
+
+    def load(self):
+        """Load the cache from disk, starting empty if missing, stale or corrupt."""
+        self.loaded = True
+        self.entries = {}
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = f.read()
+            magic, version, generation = HEADER.unpack_from(data, 0)
+        except (OSError, struct.error):
+            return
+        if magic != MAGIC or version != self.VERSION:
+            self.dirty = True
+            return
+
+        self.generation = generation + 1
+        position = HEADER.size
+        try:
+            while position < len(data):
+                digest, used, num_fields = ENTRY.unpack_from(data, position)
+                position += ENTRY.size
+                fields = {}
+                for _ in range(num_fields):
+                    (name_length,) = FIELD_NAME.unpack_from(data, position)
+                    position += FIELD_NAME.size
+                    name = data[position:position + name_length].decode('utf-8')
+                    position += name_length
+                    (length,) = LENGTH.unpack_from(data, position)
+                    position += LENGTH.size
+                    if position + length > len(data):
+                        raise ValueError("truncated parse cache entry")
+                    fields[name] = data[position:position + length]
+                    position += length
+                self.entries[digest] = [used, fields]
+        except (struct.error, ValueError):
+            # A truncated file keeps the entries read so far
+            self.dirty = True
+
+    def save(self):
+        """Write the cache back to disk if anything changed, evicting the least recently used entries."""
+        if not self.dirty:
+            return
+
+        budget = self.max_bytes - HEADER.size
+        kept = []
+        for digest, (used, fields) in sorted(self.entries.items(), key=lambda item: -item[1][0]):
+            size = ENTRY.size + sum(FIELD_NAME.size + len(name.encode('utf-8')) + LENGTH.size + len(data)
+                                    for name, data in fields.items())
+            if size > budget:
+                break
+            budget -= size
+            kept.append(digest)
+        self.entries = {digest: self.entries[digest] for digest in kept}
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.VERSION, self.generation))
+            for digest, (used, fields) in self.entries.items():
+                f.write(ENTRY.pack(digest, used, len(fields)))
+                for name, data in fields.items():
+                    encoded = name.encode('utf-8')
+                    f.write(FIELD_NAME.pack(len(encoded)))
+                    f.write(encoded)
+                    f.write(LENGTH.pack(len(data)))
+                    f.write(data)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+    def get(self, key: bytes, field: str) -> Optional[bytes]:
+        """Return a cached field of the note with this content hash, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            data = entry[1].get(field) if entry else None
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Recency alone does not make the cache dirty; it is written with the next change
+            entry[0] = self.generation
+            return data
+
+    def put(self, key: bytes, field: str, data: bytes, replace_prefix: Optional[str] = None):
+        """Store a field for the note with this content hash.
+
+        Other fields of the note whose names start with ``replace_prefix``
+        are dropped, so a field computed under new settings replaces the old
+        one instead of piling up next to it.
+        """
+        data = bytes(data)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = [self.generation, {}]
+            entry[0] = self.generation
+            fields = entry[1]
+            if replace_prefix:
+                for name in [name for name in fields if name.startswith(replace_prefix) and name != field]:
+                    del fields[name]
+            fields[field] = data
+            self.dirty = True
+
+    def tokens(self, content: str, key: Optional[bytes] = None) -> List[Token]:
+        """Return a note's markdown tokens, tokenizing and caching them on a miss."""
+        if key is None:
+            key = content_key(content)
+        data = self.get(key, TOKENS_FIELD)
+        if data is not None:
+            return decode_tokens(data)
+        tokens = list(tokenize(content))
+        self.put(key, TOKENS_FIELD, encode_tokens(tokens))
+        return tokens
+
+    def __len__(self):
+        return len(self.entries)
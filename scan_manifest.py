@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+On-disk scan manifest for incremental vault scans.
+
+The manifest remembers, for every markdown file seen by the last scan, its
+modification time, size and content hash together with the parsed result.
+A later scan only re-reads files whose (mtime, size) changed and only
+re-parses files whose content hash changed; everything else is loaded from
+the manifest.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class ScanManifest:
+    """Persistent record of (mtime, size, hash) and parse results per note."""
+
+    VERSION = 5
+
+    def __init__(self, manifest_path: Path):
+        self.manifest_path = Path(manifest_path)
+        self.entries = {}  # relative path -> entry dict
+        self.dirty = False
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        """Hash raw file bytes for change detection."""
+        return hashlib.sha1(data).hexdigest()
+
+    def load(self):
+        """Load the manifest from disk, starting empty if missing or stale."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+            return
+
+        if data.get('version') != self.VERSION:
+            self.entries = {}
+            self.dirty = True
+            return
+
+        self.entries = data.get('entries', {})
+
+    def save(self):
+        """Write the manifest back to disk if anything changed."""
+        if not self.dirty:
+            return
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+        self.dirty = False
+
+    def lookup(self, relative_path: str, mtime_ns: int, size: int) -> Optional[Dict]:
+        """Return the cached entry if the file is unchanged on disk."""
+        entry = self.entries.get(relative_path)
+        if entry and entry['mtime_ns'] == mtime_ns and entry['size'] == size:
+            return entry
+        return None
+
+    def lookup_hash(self, relative_path: str, digest: str) -> Optional[Dict]:
+        """Return the cached entry if the file content is unchanged."""
+        entry = self.entries.get(relative_path)
+        if entry and entry['hash'] == digest:
+            return entry
+        return None
+
+    def record(self, relative_path: str, mtime_ns: int, size: int, digest: str, parsed: Dict):
+        """Store the stat data, hash and parse result for a file."""
+        entry = {'mtime_ns': mtime_ns, 'size': size, 'hash': digest}
+        entry.update(parsed)
+        self.entries[relative_path] = entry
+        self.dirty = True
+
+    def touch(self, relative_path: str, mtime_ns: int, size: int):
+        """Refresh stat data for a file whose content hash did not change."""
+        entry = self.entries[relative_path]
+        entry['mtime_ns'] = mtime_ns
+        entry['size'] = size
+        self.dirty = True
+
+    def prune(self, seen: Iterable[str]) -> List[str]:
+        """Drop entries for files that no longer exist; return their paths."""
+        seen = set(seen)
+        removed = [path for path in self.entries if path not in seen]
+        for path in removed:
+            del self.entries[path]
+        if removed:
+            self.dirty = True
+        return removed
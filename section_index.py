@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Per-note index of headings and ``^block`` IDs for section-level links.
+
+Offsets are UTF-8 byte offsets of each heading line and ``^block``
+marker, kept in ``array`` buffers next to the heading levels, so an index
+is a few compact arrays plus the title strings and round-trips cheaply
+through JSON. Headings and block IDs come from the markdown tokenizer, so
+anything inside code is ignored.
+"""
+
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from markdown_tokenizer import BLOCK_ID, HEADING, Token, byte_offsets, tokenize
+
+# Characters that would end or nest a [[Note#Heading]] link
+UNLINKABLE_HEADING = re.compile(r'\[\[|[|#^]')
+
+
+def normalize_heading(text: str) -> str:
+    """Case-fold a heading and collapse whitespace, as heading links are matched."""
+    return ' '.join(text.casefold().split())
+
+
+class SectionIndex:
+    """Headings (level, title, byte offset) and block IDs (ID, byte offset) of one note."""
+
+    __slots__ = ('levels', 'offsets', 'titles', 'block_ids', 'block_offsets', '_by_title')
+
+    def __init__(self, levels: Iterable[int] = (), offsets: Iterable[int] = (), titles: Iterable[str] = (),
+                 block_ids: Iterable[str] = (), block_offsets: Iterable[int] = ()):
+        self.levels = array('B', levels)
+        self.offsets = array('L', offsets)
+        self.titles = list(titles)
+        self.block_ids = list(block_ids)
+        self.block_offsets = array('L', block_offsets)
+        self._by_title = None
+
+    @classmethod
+    def from_tokens(cls, content: str, tokens: Iterable[Token]) -> 'SectionIndex':
+        """Build the index from a note's heading and block ID tokens."""
+        sections = [token for token in tokens if token.kind == HEADING or token.kind == BLOCK_ID]
+        offsets = byte_offsets(content, (token.start for token in sections))
+        index = cls()
+        for token, offset in zip(sections, offsets):
+            if token.kind == HEADING:
+                index.levels.append(token.level)
+                index.offsets.append(offset)
+                index.titles.append(token.target)
+            else:
+                index.block_ids.append(token.target)
+                index.block_offsets.append(offset)
+        return index
+
+    @classmethod
+    def from_content(cls, content: str) -> 'SectionIndex':
+        """Tokenize a note's text and build its index."""
+        return cls.from_tokens(content, tokenize(content))
+
+    def to_dict(self) -> Dict[str, List]:
+        return {
+            'levels': self.levels.tolist(),
+            'offsets': self.offsets.tolist(),
+            'titles': self.titles,
+            'block_ids': self.block_ids,
+            'block_offsets': self.block_offsets.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List]) -> 'SectionIndex':
+        return cls(data['levels'], data['offsets'], data['titles'], data['block_ids'], data['block_offsets'])
+
+    def heading(self, anchor: str) -> Optional[int]:
+        """Return the position of the heading an anchor names, or None.
+
+        Nested anchors (``Parent#Child``) match on their last heading.
+        """
+        if self._by_title is None:
+            self._by_title = {}
+            for i, title in enumerate(self.titles):
+                self._by_title.setdefault(normalize_heading(title), i)
+        return self._by_title.get(normalize_heading(anchor.rsplit('#', 1)[-1]))
+
+    def block(self, block_id: str) -> Optional[int]:
+        """Return the byte offset of a ``^block`` ID, or None."""
+        try:
+            return self.block_offsets[self.block_ids.index(block_id)]
+        except ValueError:
+            return None
+
+    def has_anchor(self, anchor: str) -> bool:
+        """True if a link anchor (``Heading`` or ``^block``) exists in the note."""
+        if anchor.startswith('^'):
+            return self.block(anchor[1:]) is not None
+        return self.heading(anchor) is not None
+
+    def find_title(self, terms: Iterable[str]) -> Optional[str]:
+        """Return a section heading whose title contains one of the (lowercased) terms.
+
+        Terms are tried in order, so earlier terms win over earlier headings.
+        Level-1 headings are skipped since they title the whole note, and so
+        are headings with link syntax, which cannot be written as an anchor.
+        """
+        sections = [
+            (title, title.lower()) for level, title in zip(self.levels, self.titles)
+            if level != 1 and not UNLINKABLE_HEADING.search(title)
+        ]
+        for term in terms:
+            if not term:
+                continue
+            for title, lowered in sections:
+                if term in lowered:
+                    return title
+        return None
+
+    def __len__(self):
+        return len(self.titles) + len(self.block_ids)
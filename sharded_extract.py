@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Sharded link, concept and mention extraction with mergeable partial results.
+
+Notes are split into shards. Each shard is tokenized and matched in a
+worker process and comes back as a `PartialFeatures`: flat ``array``
+buffers of link edges, concept hits and unlinked-mention hits rather than
+per-note Python objects, so results are cheap to send between processes.
+Partials merge in shard order, which makes the merged result identical to
+a single in-process pass.
+
+Workers receive the link resolver and keyword lists once, through the
+pool initializer, instead of once per shard. Notes whose token stream is
+in the parse cache are sent with it and are not tokenized again.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from keyword_matcher import compile_matcher
+from link_graph import INDEX_TYPECODE
+from link_resolver import LinkResolver, is_note_target, normalize_key, split_target
+from markdown_tokenizer import EMBED, WIKI_LINK, protected_spans, tokenize
+from parse_cache import decode_tokens
+
+
+class PartialFeatures:
+    """Features extracted from one shard of notes.
+
+    Link targets that resolved hold the note ID; unresolved targets are
+    stored as ``-(i + 1)`` for entry i of ``unresolved``, a list of
+    (normalized key, name as written) local to this partial.
+    """
+
+    __slots__ = ('sources', 'targets', 'unresolved', '_unresolved_ids', 'anchors',
+                 'concept_notes', 'concept_keywords', 'mention_notes', 'mention_starts',
+                 'mention_ends', 'mention_keywords', 'mention_texts')
+
+    def __init__(self):
+        self.sources = array(INDEX_TYPECODE)
+        self.targets = array(INDEX_TYPECODE)
+        self.unresolved: List[Tuple[str, str]] = []
+        self._unresolved_ids: Dict[str, int] = {}
+        self.anchors: List[Tuple[int, int, str]] = []  # (source, target note, anchor)
+        self.concept_notes = array(INDEX_TYPECODE)
+        self.concept_keywords = array(INDEX_TYPECODE)  # index into the concept keyword list
+        self.mention_notes = array(INDEX_TYPECODE)
+        self.mention_starts = array(INDEX_TYPECODE)
+        self.mention_ends = array(INDEX_TYPECODE)
+        self.mention_keywords = array(INDEX_TYPECODE)  # index into the mention keyword list
+        self.mention_texts: List[str] = []  # mentions as written
+
+    def add_link(self, source: int, target: Optional[int], name: str):
+        """Record an edge to a note ID, or to an unresolved name when target is None."""
+        if target is None:
+            key = normalize_key(name)
+            local = self._unresolved_ids.get(key)
+            if local is None:
+                local = self._unresolved_ids[key] = len(self.unresolved)
+                self.unresolved.append((key, name))
+            target = -(local + 1)
+        self.sources.append(source)
+        self.targets.append(target)
+
+    def merge(self, other: 'PartialFeatures'):
+        """Append another partial, remapping its unresolved targets onto this one's."""
+        remap = []
+        for key, name in other.unresolved:
+            local = self._unresolved_ids.get(key)
+            if local is None:
+                local = self._unresolved_ids[key] = len(self.unresolved)
+                self.unresolved.append((key, name))
+            remap.append(-(local + 1))
+        self.sources.extend(other.sources)
+        self.targets.extend(target if target >= 0 else remap[-target - 1] for target in other.targets)
+        self.anchors.extend(other.anchors)
+        self.concept_notes.extend(other.concept_notes)
+        self.concept_keywords.extend(other.concept_keywords)
+        self.mention_notes.extend(other.mention_notes)
+        self.mention_starts.extend(other.mention_starts)
+        self.mention_ends.extend(other.mention_ends)
+        self.mention_keywords.extend(other.mention_keywords)
+        self.mention_texts.extend(other.mention_texts)
+
+
+def add_note_links(partial: PartialFeatures, resolver: LinkResolver, note_id: int,
+                   links: Iterable[str], embeds: Iterable[str]):
+    """Resolve one note's wiki links and note embeds into the partial."""
+    embedded = [embed for embed in embeds if is_note_target(split_target(embed)[0])]
+    for link in list(links) + embedded:
+        name, anchor = split_target(link)
+        target_id = resolver.resolve(link, note_id)
+        if anchor and target_id is not None:
+            partial.anchors.append((note_id, target_id, anchor))
+        if not name:
+            continue  # [[#Heading]] points into the note itself
+        partial.add_link(note_id, target_id, name)
+
+
+# Set in each worker process by _init_worker
+_worker_state = {}
+
+
+def _init_worker(resolver: LinkResolver, mention_keywords: Sequence[str], concept_keywords: Sequence[str]):
+    _worker_state['resolver'] = resolver
+    _worker_state['mentions'] = compile_matcher(tuple(mention_keywords), word_boundaries=True)
+    _worker_state['mention_ids'] = {keyword: i for i, keyword in enumerate(mention_keywords)}
+    _worker_state['concepts'] = compile_matcher(tuple(concept_keywords), word_boundaries=True)
+    _worker_state['concept_ids'] = {keyword: i for i, keyword in enumerate(concept_keywords)}
+
+
+def extract_shard(notes: Sequence[Tuple[int, str, Optional[bytes]]]) -> PartialFeatures:
+    """Tokenize and match every (note ID, content, cached tokens or None) of one shard."""
+    resolver = _worker_state['resolver']
+    mentions, mention_ids = _worker_state['mentions'], _worker_state['mention_ids']
+    concepts, concept_ids = _worker_state['concepts'], _worker_state['concept_ids']
+    partial = PartialFeatures()
+
+    for note_id, content, cached in notes:
+        tokens = decode_tokens(cached) if cached is not None else list(tokenize(content))
+        add_note_links(partial, resolver, note_id,
+                       (token.target for token in tokens if token.kind == WIKI_LINK),
+                       (token.target for token in tokens if token.kind == EMBED))
+
+        lower = content.lower()
+        for keyword in concepts.find_keywords(content, lower):
+            partial.concept_notes.append(note_id)
+            partial.concept_keywords.append(concept_ids[keyword])
+
+        # Mentions inside links, code and frontmatter do not count
+        spans = protected_spans(tokens)
+        span_starts = [span.start for span in spans]
+        for start, end, keyword in mentions.finditer(content, lower):
+            i = bisect_right(span_starts, start) - 1
+            if i >= 0 and start < spans[i].end:
+                continue
+            partial.mention_notes.append(note_id)
+            partial.mention_starts.append(start)
+            partial.mention_ends.append(end)
+            partial.mention_keywords.append(mention_ids[keyword])
+            partial.mention_texts.append(content[start:end])
+
+    return partial
+
+
+def extract_features(notes: Sequence[Tuple[int, str, Optional[bytes]]], resolver: LinkResolver, mention_keywords: Sequence[str],
+                     concept_keywords: Sequence[str], processes: int = 1,
+                     shard_size: Optional[int] = None) -> PartialFeatures:
+    """Extract features of all notes, sharded across ``processes`` worker processes.
+
+    Each note is a (note ID, content, encoded token stream or None) tuple.
+    ``shard_size`` defaults to about four shards per process, so every
+    worker gets work and a slow shard does not hold up the rest. With
+    ``processes`` <= 1 the shards run in this process.
+    """
+    if shard_size is None:
+        shard_size = max(1, math.ceil(len(notes) / (max(processes, 1) * 4)))
+    shards = [notes[i:i + shard_size] for i in range(0, len(notes), shard_size)]
+    result = PartialFeatures()
+    initargs = (resolver, list(mention_keywords), list(concept_keywords))
+
+    if processes > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=initargs) as pool:
+            # map() yields results in shard order
+            for partial in pool.map(extract_shard, shards):
+                result.merge(partial)
+    else:
+        _init_worker(*initargs)
+        for shard in shards:
+            result.merge(extract_shard(shard))
+    return result
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Checks for PageRank, HITS, k-core numbers and personalized PageRank.
+"""
+
+import random
+import time
+
+from graph_ranking import core_numbers, hits, pagerank, personalized_pagerank
+from link_graph import LinkGraph
+
+
+def random_graph(rng, max_nodes=12, max_edges=30):
+    n = rng.randint(1, max_nodes)
+    m = rng.randint(0, max_edges)
+    return LinkGraph(n, [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)])
+
+
+def brute_force_cores(graph):
+    neighbours = [set() for _ in range(graph.num_nodes)]
+    for source, target in graph.edges():
+        if source != target:
+            neighbours[source].add(target)
+            neighbours[target].add(source)
+    cores = [0] * graph.num_nodes
+    for k in range(1, graph.num_nodes + 1):
+        alive = set(range(graph.num_nodes))
+        while True:
+            peel = {node for node in alive if len(neighbours[node] & alive) < k}
+            if not peel:
+                break
+            alive -= peel
+        for node in alive:
+            cores[node] = k
+    return cores
+
+
+def test_pagerank_sums_to_one_and_favours_the_hub():
+    # Every leaf links to the hub; the hub links to nothing
+    graph = LinkGraph(5, [1, 2, 3, 4], [0, 0, 0, 0])
+    rank = pagerank(graph)
+    assert abs(sum(rank) - 1.0) < 1e-9
+    assert rank[0] == max(rank)
+    assert len(set(round(value, 12) for value in rank[1:])) == 1
+
+
+def test_hits_separates_hubs_and_authorities():
+    graph = LinkGraph(4, [0, 0, 1, 1], [2, 3, 2, 3])
+    hub, authority = hits(graph)
+    assert abs(sum(hub) - 1.0) < 1e-9 and abs(sum(authority) - 1.0) < 1e-9
+    assert hub[0] > hub[2] and authority[2] > authority[0]
+
+
+def test_core_numbers_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        graph = random_graph(rng)
+        assert core_numbers(graph) == brute_force_cores(graph)
+
+
+def test_core_numbers_ignore_self_links_and_reciprocal_pairs():
+    # A triangle with every link in both directions, plus a self-linked leaf
+    graph = LinkGraph(4, [0, 1, 1, 2, 2, 0, 3, 3], [1, 0, 2, 1, 0, 2, 3, 0])
+    assert core_numbers(graph) == [2, 2, 2, 1]
+
+
+def test_core_numbers_of_a_long_chain_stay_linear():
+    # Daily notes linking the previous day form one long path
+    n = 50000
+    graph = LinkGraph(n, range(n - 1), range(1, n))
+    start = time.perf_counter()
+    cores = core_numbers(graph)
+    assert time.perf_counter() - start < 2.0
+    assert set(cores) == {1}
+
+
+def test_personalized_pagerank_stays_in_the_component():
+    graph = LinkGraph(6, [0, 1, 3, 4], [1, 2, 4, 5])
+    scores, touched = personalized_pagerank(graph, 0)
+    assert set(scores) <= {0, 1, 2}
+    assert touched <= {0, 1, 2}
+    assert scores[0] > 0 and sum(scores.values()) <= 1.0 + 1e-9
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Brute-force checks for components, bridges and articulation notes.
+"""
+
+import random
+
+from graph_structure import (block_connectivity, bridges_and_articulation_points, group_labels,
+                             strongly_connected_components, weakly_connected_components)
+from link_graph import LinkGraph
+
+
+def random_graph(rng, max_nodes=10, max_edges=20):
+    n = rng.randint(1, max_nodes)
+    m = rng.randint(0, max_edges)
+    return LinkGraph(n, [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)])
+
+
+def undirected_pairs(graph, skip_node=None, skip_pair=None):
+    return {frozenset(pair) for pair in graph.edges()
+            if pair[0] != pair[1] and skip_node not in pair and frozenset(pair) != skip_pair}
+
+
+def component_count(nodes, pairs):
+    parent = {node: node for node in nodes}
+
+    def find(node):
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    for pair in pairs:
+        a, b = (find(node) for node in pair)
+        parent[a] = b
+    return len({find(node) for node in nodes})
+
+
+def reachable(graph, source):
+    seen = {source}
+    stack = [source]
+    while stack:
+        for other in graph.successors(stack.pop()):
+            if other not in seen:
+                seen.add(other)
+                stack.append(other)
+    return seen
+
+
+def partition(labels):
+    return sorted(sorted(members) for members in group_labels(labels))
+
+
+def test_weak_and_strong_components_match_brute_force():
+    rng = random.Random(3)
+    for _ in range(200):
+        graph = random_graph(rng)
+        nodes = range(graph.num_nodes)
+        reach = [reachable(graph, node) for node in nodes]
+        strong = [[b for b in nodes if b in reach[a] and a in reach[b]] for a in nodes]
+        assert partition(strongly_connected_components(graph)) == sorted(map(list, {tuple(s) for s in strong}))
+        weak = weakly_connected_components(graph)
+        assert len(set(weak)) == component_count(nodes, undirected_pairs(graph))
+        assert all(weak[a] == weak[b] for a, b in graph.edges())
+
+
+def test_bridges_and_articulation_points_match_brute_force():
+    rng = random.Random(5)
+    for _ in range(200):
+        graph = random_graph(rng)
+        nodes = list(range(graph.num_nodes))
+        pairs = undirected_pairs(graph)
+        base = component_count(nodes, pairs)
+        bridges, articulation = bridges_and_articulation_points(graph)
+
+        expected_bridges = {pair for pair in pairs
+                            if component_count(nodes, undirected_pairs(graph, skip_pair=pair)) > base}
+        expected_points = {node for node in nodes
+                           if component_count([other for other in nodes if other != node],
+                                              undirected_pairs(graph, skip_node=node)) > base}
+        assert {frozenset(pair) for pair in bridges} == expected_bridges
+        assert len(bridges) == len(expected_bridges)
+        assert articulation == expected_points
+
+
+def test_long_chain_does_not_recurse():
+    n = 20000
+    graph = LinkGraph(n, range(n - 1), range(1, n))
+    bridges, articulation = bridges_and_articulation_points(graph)
+    assert len(bridges) == n - 1
+    assert articulation == set(range(1, n - 1))
+    assert len(set(strongly_connected_components(graph))) == n
+
+
+def test_block_connectivity_counts_links_between_groups():
+    graph = LinkGraph(4, [0, 0, 1, 2, 3], [1, 2, 3, 3, 0])
+    assert block_connectivity(graph, [0, 0, 1, 1], 2) == [[1, 2], [1, 1]]
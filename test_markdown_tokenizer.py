@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Behaviour checks for the markdown tokenizer every link, heading and tag decision relies on.
+"""
+
+from link_resolver import is_note_target
+from markdown_tokenizer import (BLOCK_ID, CODE, EMBED, FRONTMATTER, HEADING, IMAGE, MARKDOWN_LINK, TAG, WIKI_LINK,
+                                protected_spans, tokenize)
+from note_model import Note
+
+
+def kinds_and_targets(content):
+    return [(token.kind, token.target) for token in tokenize(content) if token.kind != CODE]
+
+
+def links(content):
+    return [token.target for token in tokenize(content) if token.kind == WIKI_LINK]
+
+
+def test_fenced_code_hides_links():
+    content = "```python\n[[Inside]]\n```\n[[Outside]]\n"
+    tokens = list(tokenize(content))
+    assert links(content) == ['Outside']
+    code = [token for token in tokens if token.kind == CODE]
+    assert len(code) == 1
+    assert content[code[0].start:code[0].end] == "```python\n[[Inside]]\n```"
+
+
+def test_tilde_fence_needs_matching_closer():
+    # A backtick line does not close a tilde fence; a longer tilde run does
+    content = "~~~\n[[A]]\n```\n[[B]]\n~~~~\n[[C]]\n"
+    assert links(content) == ['C']
+
+
+def test_unclosed_fence_runs_to_end():
+    content = "[[Before]]\n```\n[[After]]\n"
+    tokens = list(tokenize(content))
+    assert links(content) == ['Before']
+    assert (tokens[-1].kind, tokens[-1].end) == (CODE, len(content))
+
+
+def test_inline_code_of_varying_backtick_counts():
+    content = "`[[A]]` then ``code with ` and [[B]]`` then [[C]]"
+    assert links(content) == ['C']
+    spans = [content[token.start:token.end] for token in tokenize(content) if token.kind == CODE]
+    assert spans == ["`[[A]]`", "``code with ` and [[B]]``"]
+
+
+def test_unmatched_backticks_are_text():
+    assert links("``[[A]]` and [[B]]") == ['A', 'B']
+
+
+def test_frontmatter_is_one_protected_token():
+    content = "---\ntitle: [[Not A Link]]\ntags: [x]\n---\n# Title\n[[Link]]\n"
+    tokens = list(tokenize(content))
+    assert tokens[0].kind == FRONTMATTER
+    assert content[:tokens[0].end] == "---\ntitle: [[Not A Link]]\ntags: [x]\n---\n"
+    assert links(content) == ['Link']
+
+
+def test_unclosed_frontmatter_is_text():
+    content = "---\ntitle: [[A]]\n"
+    assert all(token.kind != FRONTMATTER for token in tokenize(content))
+    assert links(content) == ['A']
+
+
+def test_escaped_brackets_are_not_links():
+    assert links("\\[[Escaped]] and [[Real]]") == ['Real']
+
+
+def test_wiki_link_anchor_and_label():
+    (token,) = tokenize("See [[Note#Heading|the heading]].")
+    assert (token.kind, token.target, token.label) == (WIKI_LINK, 'Note#Heading', 'the heading')
+    (token,) = tokenize("[[Plain]]")
+    assert token.label is None
+
+
+def test_embeds_images_and_attachments():
+    content = "![[Other Note]] ![[diagram.png]] ![alt](pic.png) [text](other.md \"Title\")"
+    assert kinds_and_targets(content) == [
+        (EMBED, 'Other Note'), (EMBED, 'diagram.png'), (IMAGE, 'pic.png'), (MARKDOWN_LINK, 'other.md'),
+    ]
+    # Embeds of attachments are not note links
+    assert is_note_target('Other Note')
+    assert not is_note_target('diagram.png')
+    assert is_note_target('v1.2 notes')
+
+
+def test_headings():
+    tokens = list(tokenize("# Title\n## Section ##\n####### Too deep\n#NoSpace\n"))
+    headings = [(token.level, token.target) for token in tokens if token.kind == HEADING]
+    assert headings == [(1, 'Title'), (2, 'Section')]
+
+
+def test_heading_keeps_inline_tokens():
+    content = "## Links to [[Target]] #topic\n"
+    assert kinds_and_targets(content) == [
+        (HEADING, 'Links to [[Target]] #topic'), (WIKI_LINK, 'Target'), (TAG, 'topic'),
+    ]
+
+
+def test_tags():
+    content = "#start mid #nested/tag-name a#b #123 (#x) #2024-notes"
+    tags = [token.target for token in tokenize(content) if token.kind == TAG]
+    assert tags == ['start', 'nested/tag-name', '2024-notes']
+
+
+def test_block_ids_only_at_line_end():
+    content = "A paragraph ^para-1\nNot ^an-id here\n^own-line\n"
+    assert [token.target for token in tokenize(content) if token.kind == BLOCK_ID] == ['para-1', 'own-line']
+
+
+def test_offsets_slice_the_source():
+    content = "---\na: b\n---\nText [[Link|Label]] and `code` #tag ^block\n"
+    for token in tokenize(content):
+        raw = content[token.start:token.end]
+        if token.kind == WIKI_LINK:
+            assert raw == '[[Link|Label]]'
+        elif token.kind == CODE:
+            assert raw == '`code`'
+        elif token.kind == TAG:
+            assert raw == '#tag'
+        elif token.kind == BLOCK_ID:
+            assert raw == '^block'
+
+
+def test_protected_spans():
+    content = "---\na: b\n---\n[[Link]] `code` [md](x.md) #tag\n"
+    kinds = [token.kind for token in protected_spans(tokenize(content))]
+    assert kinds == [FRONTMATTER, WIKI_LINK, CODE, MARKDOWN_LINK]
+
+
+def test_crlf_frontmatter():
+    content = "---\r\ntitle: [[Not A Link]]\r\naliases: [Bee]\r\n---\r\n#tag [[Link]]\r\n"
+    tokens = list(tokenize(content))
+    assert tokens[0].kind == FRONTMATTER
+    assert content[:tokens[0].end] == "---\r\ntitle: [[Not A Link]]\r\naliases: [Bee]\r\n---\r\n"
+    assert links(content) == ['Link']
+    assert [token.target for token in tokens if token.kind == TAG] == ['tag']
+    assert Note(0, 'Crlf', 'Crlf.md', content, []).aliases == ['Bee']
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Round-trip, corruption and eviction checks for the on-disk parse cache.
+"""
+
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from markdown_tokenizer import tokenize
+from parse_cache import (ENTRY, HEADER, MAGIC, ParseCache, content_key, decode_tokens, encode_tokens,
+                         pack_arrays, pack_strings, split_strings, unpack_arrays)
+
+
+def fields(tokens):
+    return [(token.kind, token.start, token.end, token.target, token.label, token.level) for token in tokens]
+
+
+def test_tokens_round_trip():
+    content = ("---\ntitle: x\n---\n# Tïtle ✓\n[[Note#Part|Label]] [[Plain]] ![[img.png]] "
+               "[md](a.md) `code` #tag ^block\n```\nfenced\n```\n")
+    tokens = list(tokenize(content))
+    decoded = decode_tokens(encode_tokens(tokens))
+    assert fields(decoded) == fields(tokens)
+    assert [token.label for token in decoded if token.target == 'Plain'] == [None]
+
+
+def test_empty_token_stream_round_trips():
+    assert decode_tokens(encode_tokens([])) == []
+
+
+def test_arrays_and_strings_round_trip():
+    data = pack_arrays(array('I', [1, 2, 3]), array('q', [-5])) + pack_strings(['', 'a', 'ünï'])
+    numbers, signed, lengths, blob = unpack_arrays(data, 'IqIB')
+    assert (numbers.tolist(), signed.tolist()) == ([1, 2, 3], [-5])
+    assert split_strings(lengths, blob) == ['', 'a', 'ünï']
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / 'cache.bin'
+    cache = ParseCache(path)
+    cache.load()
+    tokens = cache.tokens("[[A]] and [[B]]")
+    cache.put(content_key('x'), 'extra', b'\x00\x01')
+    cache.save()
+
+    warm = ParseCache(path)
+    warm.load()
+    assert fields(warm.tokens("[[A]] and [[B]]")) == fields(tokens)
+    assert warm.get(content_key('x'), 'extra') == b'\x00\x01'
+    assert (warm.hits, warm.misses) == (2, 0)
+    assert not warm.dirty  # reads alone do not rewrite the file
+
+
+def test_truncated_file_keeps_complete_entries(tmp_path):
+    path = tmp_path / 'cache.bin'
+    cache = ParseCache(path)
+    cache.load()
+    for text in ('first', 'second', 'third'):
+        cache.put(content_key(text), 'data', text.encode() * 10)
+    cache.save()
+    data = path.read_bytes()
+    path.write_bytes(data[:-5])
+
+    damaged = ParseCache(path)
+    damaged.load()
+    assert len(damaged) == 2
+    assert damaged.get(content_key('third'), 'data') is None
+    assert damaged.dirty
+
+
+def test_garbage_and_version_mismatch_start_empty(tmp_path):
+    path = tmp_path / 'cache.bin'
+    path.write_bytes(b'not a cache')
+    cache = ParseCache(path)
+    cache.load()
+    assert len(cache) == 0
+
+    path.write_bytes(HEADER.pack(MAGIC, ParseCache.VERSION + 1, 0) + ENTRY.pack(content_key('a'), 0, 0))
+    cache = ParseCache(path)
+    cache.load()
+    assert len(cache) == 0
+    assert cache.dirty  # the stale file is replaced on the next save
+
+
+def test_eviction_keeps_most_recently_used(tmp_path):
+    path = tmp_path / 'cache.bin'
+    payload = b'x' * 100
+    entry_size = ENTRY.size + 2 + len('data') + 4 + len(payload)
+    max_bytes = HEADER.size + 3 * entry_size
+
+    cache = ParseCache(path, max_bytes)
+    cache.load()
+    for text in ('a', 'b', 'c', 'd'):
+        cache.put(content_key(text), 'data', payload)
+    cache.save()
+    assert path.stat().st_size <= max_bytes
+
+    # A later run uses 'a' and adds 'e'; the entries unused for longest go
+    cache = ParseCache(path, max_bytes)
+    cache.load()
+    cached = {text for text in 'abcd' if content_key(text) in cache.entries}
+    assert len(cached) == 3
+    used = sorted(cached)[0]
+    assert cache.get(content_key(used), 'data') == payload
+    cache.put(content_key('e'), 'data', payload)
+    cache.save()
+    assert path.stat().st_size <= max_bytes
+
+    cache = ParseCache(path, max_bytes)
+    cache.load()
+    assert content_key(used) in cache.entries
+    assert content_key('e') in cache.entries
+    assert len(cache) == 3
+
+
+def test_put_replaces_other_variants_of_a_field(tmp_path):
+    cache = ParseCache(tmp_path / 'cache.bin')
+    cache.load()
+    key = content_key('note')
+    cache.put(key, 'shingles', b'1')
+    cache.put(key, 'concepts:old', b'2', replace_prefix='concepts:')
+    cache.put(key, 'concepts:new', b'3', replace_prefix='concepts:')
+    assert cache.entries[key][1] == {'shingles': b'1', 'concepts:new': b'3'}
+
+
+def test_concurrent_lookups_count_every_call(tmp_path):
+    cache = ParseCache(tmp_path / 'cache.bin')
+    cache.load()
+    texts = [f"[[Note {i % 50}]] #tag{i % 7}" for i in range(2000)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(cache.tokens, texts))
+    assert cache.hits + cache.misses == len(texts)
+    assert len(cache) == len(set(texts))
+    assert [fields(tokens) for tokens in results] == [fields(tokenize(text)) for text in texts]
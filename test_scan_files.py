@@ -5,26 +5,27 @@ Test scanning for markdown files in the vault.
 
 from pathlib import Path
 
+from vault_walker import walk_vault
+
 def main():
     vault_path = Path(__file__).parent
     print(f"Scanning vault: {vault_path}")
     print("")
     
     # Count markdown files
-    md_files = list(vault_path.rglob('*.md'))
+    md_files = list(walk_vault(vault_path))
     print(f"Found {len(md_files)} markdown files")
     
     # Show first 10
     print("\nFirst 10 files:")
     for i, md_file in enumerate(md_files[:10]):
-        relative = md_file.relative_to(vault_path)
-        print(f"  {i+1}. {relative}")
+        print(f"  {i+1}. {md_file.relative}")
     
     # Count by directory
     print("\nFiles by directory:")
     dirs = {}
     for md_file in md_files:
-        parent = md_file.parent.relative_to(vault_path)
+        parent = md_file.path.parent.relative_to(vault_path)
         parent_str = str(parent) if str(parent) != '.' else 'root'
         dirs[parent_str] = dirs.get(parent_str, 0) + 1
     
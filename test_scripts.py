@@ -88,8 +88,9 @@ def test_generate_links():
         print("✅ Script imports successfully")
         
         # Check vault structure
+        from vault_walker import walk_vault
         vault_path = Path(__file__).parent
-        md_files = list(vault_path.rglob('*.md'))
+        md_files = list(walk_vault(vault_path))
         print(f"✅ Found {len(md_files)} markdown files in vault")
         
         return True
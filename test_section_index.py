@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Checks for heading and block lookups used by section-level links.
+"""
+
+from section_index import SectionIndex
+
+
+def test_from_content_indexes_headings_and_blocks():
+    index = SectionIndex.from_content("# Title\nText ^intro\n## Ünïcode Part\n```\n## Not a heading\n```\n")
+    assert index.titles == ['Title', 'Ünïcode Part']
+    assert index.block_ids == ['intro']
+    assert index.has_anchor('ünïcode   part') and index.has_anchor('Title#Ünïcode Part')
+    assert index.has_anchor('^intro') and not index.has_anchor('^missing')
+    assert SectionIndex.from_dict(index.to_dict()).offsets == index.offsets
+
+
+def test_find_title_tries_terms_in_order():
+    index = SectionIndex.from_content("# Note\n## Cognition.ai Alignment\n## Why the methodology works\n")
+    assert index.find_title(['methodology', 'cognition']) == 'Why the methodology works'
+    assert index.find_title(['cognition', 'methodology']) == 'Cognition.ai Alignment'
+    assert index.find_title(['note']) is None  # the level-1 heading titles the whole note
+
+
+def test_find_title_skips_headings_with_link_syntax():
+    index = SectionIndex.from_content("## See [[Other|CAM]] details\n## C# and CAM\n## Block ^ref CAM\n## CAM roles\n")
+    assert index.find_title(['cam']) == 'CAM roles'
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Checks for TF-IDF neighbours, MinHash signatures and near-duplicate detection.
+"""
+
+import random
+
+import text_similarity
+from text_similarity import (MERSENNE_PRIME, MinHasher, TermCounts, TfidfMatrix, content_digest, find_near_duplicates,
+                             near_duplicate_signatures, shingles, term_frequencies, tokenize)
+
+
+def test_term_counts_share_one_vocabulary():
+    counts = TermCounts()
+    counts.add({'alpha': 2, 'beta': 1})
+    counts.add({'beta': 3})
+    assert counts.terms == ['alpha', 'beta']
+    assert len(counts) == 2
+    assert (counts.indices.tolist(), counts.counts.tolist(), counts.indptr.tolist()) == ([0, 1, 1], [2, 1, 3], [0, 2, 3])
+
+
+def test_tfidf_from_term_counts_matches_documents():
+    rng = random.Random(1)
+    words = [f'word{i}' for i in range(50)]
+    documents = [[rng.choice(words) for _ in range(rng.randint(0, 30))] for _ in range(40)]
+    counts = TermCounts()
+    for tokens in documents:
+        counts.add(term_frequencies(tokens))
+
+    direct, counted = TfidfMatrix(documents), TfidfMatrix([], term_counts=counts)
+    assert direct.vocabulary == counted.vocabulary
+    assert direct.indptr == counted.indptr and direct.indices == counted.indices and direct.data == counted.data
+
+
+def test_top_k_similar_finds_the_closest_note():
+    documents = [tokenize(text) for text in (
+        "graph ranking pagerank notes links",
+        "graph ranking pagerank notes backlinks",
+        "cooking recipes pasta sauce dinner",
+        "cooking recipes pasta sauce lunch",
+    )]
+    neighbours = TfidfMatrix(documents, max_df=1.0, min_df=1).top_k_similar(k=1)
+    assert [[other for other, _ in row] for row in neighbours] == [[1], [0], [3], [2]]
+
+
+def test_signature_of_a_large_set_matches_the_definition(monkeypatch):
+    hasher = MinHasher(num_perm=16)
+    shingle_set = set(random.Random(2).sample(range(1 << 32), 5000))
+    expected = [min((a * (value % MERSENNE_PRIME) + b) % MERSENNE_PRIME for value in shingle_set)
+                for a, b in zip(hasher.a, hasher.b)]
+    assert list(hasher.signature(shingle_set)) == expected
+    monkeypatch.setattr(text_similarity, 'np', None)
+    assert list(hasher.signature(shingle_set)) == expected
+
+
+def test_near_duplicates_pair_identical_and_similar_texts():
+    base = ' '.join(f'word{i}' for i in range(60))
+    texts = [base, base, base.replace('word30', 'changed'), 'something else entirely with other words']
+    pairs = {(i, j): score for i, j, score in find_near_duplicates(texts)}
+    assert pairs[(0, 1)] == 1.0
+    assert 0.7 <= pairs[(0, 2)] < 1.0 and (0, 3) not in pairs
+
+
+def test_empty_notes_are_not_duplicates():
+    texts = ['', '', '---\n', '---\n', 'real text here']
+    assert find_near_duplicates(texts) == []
+    hasher = MinHasher()
+    signatures = [hasher.signature(shingles(text)) if shingles(text) else None for text in texts]
+    assert near_duplicate_signatures(signatures, [content_digest(text) for text in texts]) == []
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Content similarity between notes.
+
+Builds a sparse TF-IDF matrix over all notes (one sorted term-ID row per
+note) and finds each note's top-k cosine neighbours through an inverted
+index, so only note pairs that share a term are ever scored and the dense
+N×N similarity matrix is never materialized. With NumPy installed, the
+per-row sparse products are vectorized.
+
+Near-duplicate notes are found with word shingles, MinHash signatures and
+banded locality-sensitive hashing, which yields candidate pairs without
+comparing every pair of notes.
+"""
+
+import hashlib
+import heapq
+import math
+import random
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to pure Python
+    np = None
+
+WORD_PATTERN = re.compile(r'[a-z][a-z0-9_-]*[a-z0-9]')
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just let me more most my myself
+no nor not now of off on once only or other our ours ourselves out over own same she should so some such
+than that the their theirs them themselves then there these they this those through to too under until up
+use used uses using very via was we were what when where which while who whom why will with would you your
+yours yourself yourselves
+""".split())
+
+
+def words(text: str) -> List[str]:
+    """Lowercase words of the text, single characters removed; the unit of terms and shingles."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def terms(words: Iterable[str]) -> List[str]:
+    """Drop stopwords from lowercase words."""
+    return [word for word in words if word not in STOPWORDS]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords and single characters removed."""
+    return terms(words(text))
+
+
+def term_frequencies(tokens: Iterable[str]) -> Dict[str, int]:
+    """Count each token of a document."""
+    tf = {}
+    for token in tokens:
+        tf[token] = tf.get(token, 0) + 1
+    return tf
+
+
+class TermCounts:
+    """Term counts of many documents in CSR form over one shared vocabulary.
+
+    Each distinct term is stored once; a document costs a (term ID, count)
+    pair of 32-bit integers per distinct term, however many documents
+    repeat it.
+    """
+
+    def __init__(self):
+        self.terms: List[str] = []  # term ID -> term
+        self.term_ids: Dict[str, int] = {}  # term -> term ID
+        self.indptr = array('I', [0])
+        self.indices = array('I')
+        self.counts = array('I')
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def add(self, counts: Dict[str, int]):
+        """Append a document given as term -> count."""
+        term_ids = self.term_ids
+        for term, count in counts.items():
+            term_id = term_ids.get(term)
+            if term_id is None:
+                term_id = term_ids[term] = len(self.terms)
+                self.terms.append(term)
+            self.indices.append(term_id)
+            self.counts.append(count)
+        self.indptr.append(len(self.indices))
+
+
+class TfidfMatrix:
+    """Row-normalized sparse TF-IDF matrix in CSR form.
+
+    Term frequencies are sublinear (1 + log tf) and terms that appear in
+    more than ``max_df`` of the documents are dropped, since they carry
+    almost no weight but dominate the cost of the similarity products.
+    """
+
+    def __init__(self, documents: Sequence[Iterable[str]], max_df: float = 0.5, min_df: int = 2,
+                 term_counts: Optional[TermCounts] = None):
+        """Build from token sequences, or from precomputed ``term_counts``."""
+        if term_counts is None:
+            term_counts = TermCounts()
+            for tokens in documents:
+                term_counts.add(term_frequencies(tokens))
+        document_frequency = [0] * len(term_counts.terms)
+        for term_id in term_counts.indices:
+            document_frequency[term_id] += 1
+
+        n = len(term_counts)
+        self.num_rows = n
+        max_count = max(max_df * n, min_df)
+        vocabulary = sorted(term for term, df in zip(term_counts.terms, document_frequency)
+                            if min_df <= df <= max_count)
+        self.vocabulary = {term: term_id for term_id, term in enumerate(vocabulary)}
+        self.idf = array('d', (math.log((1 + n) / (1 + document_frequency[term_counts.term_ids[term]])) + 1.0
+                               for term in vocabulary))
+        # Counted term ID -> matrix column, -1 for dropped terms
+        columns = [-1] * len(term_counts.terms)
+        for term, term_id in self.vocabulary.items():
+            columns[term_counts.term_ids[term]] = term_id
+
+        self.indptr = array('i', [0])
+        self.indices = array('i')
+        self.data = array('d')
+        for document in range(n):
+            start, end = term_counts.indptr[document], term_counts.indptr[document + 1]
+            row = sorted(
+                (columns[term_id], (1.0 + math.log(count)) * self.idf[columns[term_id]])
+                for term_id, count in zip(term_counts.indices[start:end], term_counts.counts[start:end])
+                if columns[term_id] >= 0
+            )
+            norm = math.sqrt(sum(weight * weight for _, weight in row)) or 1.0
+            for term_id, weight in row:
+                self.indices.append(term_id)
+                self.data.append(weight / norm)
+            self.indptr.append(len(self.indices))
+
+        self._build_postings()
+
+    def _build_postings(self):
+        """Build the transposed (CSC) copy used to find rows sharing a term."""
+        num_terms = len(self.vocabulary)
+        counts = [0] * (num_terms + 1)
+        for term_id in self.indices:
+            counts[term_id + 1] += 1
+        for i in range(num_terms):
+            counts[i + 1] += counts[i]
+
+        self.col_indptr = array('i', counts)
+        self.col_rows = array('i', bytes(len(self.indices) * self.col_indptr.itemsize))
+        self.col_data = array('d', bytes(len(self.indices) * self.data.itemsize))
+        fill = counts[:-1]
+        for row in range(self.num_rows):
+            for i in range(self.indptr[row], self.indptr[row + 1]):
+                term_id = self.indices[i]
+                self.col_rows[fill[term_id]] = row
+                self.col_data[fill[term_id]] = self.data[i]
+                fill[term_id] += 1
+
+    def row(self, row: int) -> Tuple[array, array]:
+        """Return (term IDs, weights) of one row."""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def top_k_similar(self, k: int = 5, min_score: float = 0.1) -> List[List[Tuple[int, float]]]:
+        """Return, for every row, up to k (row, cosine) neighbours scoring at least min_score."""
+        if np is not None:
+            return self._top_k_numpy(k, min_score)
+
+        neighbours = []
+        for row in range(self.num_rows):
+            scores = {}
+            for i in range(self.indptr[row], self.indptr[row + 1]):
+                term_id, weight = self.indices[i], self.data[i]
+                for j in range(self.col_indptr[term_id], self.col_indptr[term_id + 1]):
+                    other = self.col_rows[j]
+                    scores[other] = scores.get(other, 0.0) + weight * self.col_data[j]
+            scores.pop(row, None)
+            best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+            neighbours.append([(other, score) for other, score in best if score >= min_score])
+        return neighbours
+
+    def _top_k_numpy(self, k: int, min_score: float) -> List[List[Tuple[int, float]]]:
+        indptr = np.frombuffer(self.indptr, dtype=np.int32)
+        indices = np.frombuffer(self.indices, dtype=np.int32)
+        data = np.frombuffer(self.data, dtype=np.float64)
+        col_indptr = np.frombuffer(self.col_indptr, dtype=np.int32)
+        col_rows = np.frombuffer(self.col_rows, dtype=np.int32)
+        col_data = np.frombuffer(self.col_data, dtype=np.float64)
+
+        neighbours = []
+        for row in range(self.num_rows):
+            terms = indices[indptr[row]:indptr[row + 1]]
+            if not len(terms):
+                neighbours.append([])
+                continue
+            # Gather every posting of the row's terms: one sparse row-times-matrix product
+            starts, ends = col_indptr[terms], col_indptr[terms + 1]
+            lengths = ends - starts
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            weights = np.repeat(data[indptr[row]:indptr[row + 1]], lengths) * col_data[offsets]
+            rows = col_rows[offsets]
+            if len(rows) * 4 > self.num_rows:
+                # Dense enough that a full-length accumulator beats sorting
+                scores = np.bincount(rows, weights=weights, minlength=self.num_rows)
+                others = np.flatnonzero(scores)
+                scores = scores[others]
+            else:
+                others, inverse = np.unique(rows, return_inverse=True)
+                scores = np.bincount(inverse, weights=weights)
+            scores[others == row] = -1.0
+
+            if len(scores) > k:
+                best = np.argpartition(-scores, k)[:k]
+            else:
+                best = np.arange(len(scores))
+            best = best[np.lexsort((others[best], -scores[best]))]
+            neighbours.append([
+                (int(others[i]), float(scores[i])) for i in best if scores[i] >= min_score
+            ])
+        return neighbours
+
+
+MERSENNE_PRIME = (1 << 31) - 1
+SIGNATURE_CHUNK = 1024  # shingles hashed per NumPy block, so long notes need no huge temporaries
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Return the set of hashed word ``size``-grams of the text.
+
+    Hashes are CRC32 so signatures are stable across processes.
+    """
+    return word_shingles(words(text), size)
+
+
+def word_shingles(words: Sequence[str], size: int = 5) -> Set[int]:
+    """`shingles` of text already split into lowercase words."""
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hash functions mod 2^31-1."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: Set[int]) -> array:
+        """Return the signature of a non-empty shingle set."""
+        if np is not None:
+            values = np.fromiter(shingle_set, dtype=np.int64, count=len(shingle_set)) % MERSENNE_PRIME
+            a = np.array(self.a, dtype=np.int64)[:, None]
+            b = np.array(self.b, dtype=np.int64)[:, None]
+            signature = np.full(self.num_perm, MERSENNE_PRIME, dtype=np.int64)
+            for start in range(0, len(values), SIGNATURE_CHUNK):
+                chunk = values[None, start:start + SIGNATURE_CHUNK]
+                np.minimum(signature, ((a * chunk + b) % MERSENNE_PRIME).min(axis=1), out=signature)
+            return array('q', signature.tolist())
+
+        values = [value % MERSENNE_PRIME for value in shingle_set]
+        return array('q', (
+            min((a * value + b) % MERSENNE_PRIME for value in values)
+            for a, b in zip(self.a, self.b)
+        ))
+
+
+def signature_similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimate Jaccard similarity as the share of equal signature slots."""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def lsh_bands(threshold: float, num_perm: int = 128, recall: float = 0.995) -> Tuple[int, int]:
+    """Return the (bands, rows) split of a signature for finding pairs at the threshold.
+
+    A pair with Jaccard similarity s collides in some band with probability
+    1 - (1 - s^rows)^bands. The widest bands (fewest false candidates) that
+    still catch a pair right at the threshold with the given recall win;
+    for 128 slots and a 0.7 threshold that is 32 bands of 4 rows.
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands, rows
+    return num_perm, 1
+
+
+class LSHIndex:
+    """Banded locality-sensitive hashing over MinHash signatures.
+
+    Two signatures become a candidate pair when all ``rows`` slots of at
+    least one band agree. The chance of that rises along an S-curve in
+    the Jaccard similarity with its midpoint near (1 / bands)^(1 / rows),
+    so use `lsh_bands` to place the midpoint well below the similarity
+    threshold and check candidates exactly afterwards.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 8):
+        self.bands = bands
+        self.rows = rows
+        self.keys = array('i')
+        # One hash per band and key instead of a bucket dict, so the index costs 8 bytes per band
+        self.band_hashes = [array('q') for _ in range(bands)]
+
+    def add(self, key: int, signature: Sequence[int]):
+        self.keys.append(key)
+        for band, hashes in enumerate(self.band_hashes):
+            start = band * self.rows
+            hashes.append(hash(tuple(signature[start:start + self.rows])))
+
+    def candidate_pairs(self) -> Set[Tuple[int, int]]:
+        """Return every (smaller key, larger key) pair sharing a bucket."""
+        pairs = set()
+        keys = self.keys
+        for hashes in self.band_hashes:
+            order = sorted(range(len(hashes)), key=hashes.__getitem__)
+            start = 0
+            for end in range(1, len(order) + 1):
+                if end < len(order) and hashes[order[end]] == hashes[order[start]]:
+                    continue
+                bucket = [keys[i] for i in order[start:end]]
+                for i, first in enumerate(bucket):
+                    for second in bucket[i + 1:]:
+                        pairs.add((min(first, second), max(first, second)))
+                start = end
+        return pairs
+
+
+def find_near_duplicates(texts: Sequence[str], threshold: float = 0.7, shingle_size: int = 5,
+                         num_perm: int = 128, bands: Optional[int] = None) -> List[Tuple[int, int, float]]:
+    """Return (i, j, jaccard) for text pairs at or above the threshold.
+
+    Identical texts are paired directly by hash and texts without words
+    (such as empty notes) not at all; the rest go through MinHash and LSH,
+    and only the resulting candidate pairs are checked against their exact
+    shingle-set Jaccard similarity. ``bands`` defaults to the `lsh_bands`
+    split for the threshold.
+    """
+    return near_duplicate_pairs(
+        [shingles(text, shingle_size) for text in texts],
+        [content_digest(text) for text in texts],
+        threshold, num_perm, bands,
+    )
+
+
+def content_digest(text: str) -> bytes:
+    """Hash used to pair byte-identical texts."""
+    return hashlib.sha1(text.encode('utf-8')).digest()
+
+
+def _identical_pairs(digests: Sequence[bytes], has_words: Sequence[bool]) -> Dict[Tuple[int, int], float]:
+    """Pair every two texts with the same digest at similarity 1.0.
+
+    Texts without words, such as empty notes, say nothing about each other
+    and are never paired.
+    """
+    identical = {}
+    for i, digest in enumerate(digests):
+        if has_words[i]:
+            identical.setdefault(digest, []).append(i)
+    results = {}
+    for group in identical.values():
+        for k, first in enumerate(group):
+            for second in group[k + 1:]:
+                results[(first, second)] = 1.0
+    return results
+
+
+def near_duplicate_pairs(shingle_sets: Sequence[Set[int]], digests: Sequence[bytes], threshold: float = 0.7,
+                         num_perm: int = 128, bands: Optional[int] = None) -> List[Tuple[int, int, float]]:
+    """`find_near_duplicates` over precomputed shingle sets and content digests."""
+    hasher = MinHasher(num_perm)
+    if bands is None:
+        bands, rows = lsh_bands(threshold, num_perm)
+    else:
+        rows = num_perm // bands
+    index = LSHIndex(bands, rows)
+    for i, shingle_set in enumerate(shingle_sets):
+        if shingle_set:
+            index.add(i, hasher.signature(shingle_set))
+
+    results = _identical_pairs(digests, [bool(shingle_set) for shingle_set in shingle_sets])
+
+    for first, second in index.candidate_pairs():
+        if (first, second) in results:
+            continue
+        a, b = shingle_sets[first], shingle_sets[second]
+        similarity = len(a & b) / len(a | b)
+        if similarity >= threshold:
+            results[(first, second)] = similarity
+
+    return sorted(((i, j, score) for (i, j), score in results.items()), key=lambda item: (-item[2], item[0], item[1]))
+
+
+def near_duplicate_signatures(signatures: Sequence[Optional[Sequence[int]]], digests: Sequence[bytes],
+                              threshold: float = 0.7, bands: Optional[int] = None) -> List[Tuple[int, int, float]]:
+    """Like `near_duplicate_pairs`, but from MinHash signatures alone.
+
+    Similarity is the signature estimate of the Jaccard similarity, so
+    shingle sets never have to be kept. Texts without shingles have a
+    ``None`` signature and are never paired.
+    """
+    num_perm = len(next((signature for signature in signatures if signature is not None), ()))
+    if bands is None:
+        bands, rows = lsh_bands(threshold, num_perm)
+    else:
+        rows = num_perm // bands
+    index = LSHIndex(bands, rows)
+    for i, signature in enumerate(signatures):
+        if signature is not None:
+            index.add(i, signature)
+
+    results = _identical_pairs(digests, [signature is not None for signature in signatures])
+
+    for first, second in index.candidate_pairs():
+        if (first, second) in results:
+            continue
+        similarity = signature_similarity(signatures[first], signatures[second])
+        if similarity >= threshold:
+            results[(first, second)] = similarity
+
+    return sorted(((i, j, score) for (i, j), score in results.items()), key=lambda item: (-item[2], item[0], item[1]))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Shared vault walker for the knowledge graph scripts.
+
+Walks the vault with ``os.scandir`` and prunes hidden and excluded
+directories before descending into them, so `.git` and `.obsidian` are never
+listed. Each yielded entry carries its stat result, taken from the directory
+listing, so callers do not need a second ``stat`` per file.
+"""
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Pattern
+
+# Directories never worth descending into, in addition to hidden ones
+DEFAULT_EXCLUDED_DIRS = ('__pycache__', 'node_modules')
+
+
+class VaultEntry:
+    """A file found by the walker, with its stat data attached."""
+
+    __slots__ = ('path', 'relative', 'stat')
+
+    def __init__(self, path: Path, relative: str, stat: os.stat_result):
+        self.path = path
+        self.relative = relative  # POSIX-style path relative to the vault root
+        self.stat = stat
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem
+
+    @property
+    def mtime_ns(self) -> int:
+        return self.stat.st_mtime_ns
+
+    @property
+    def size(self) -> int:
+        return self.stat.st_size
+
+    def __repr__(self):
+        return f"VaultEntry({self.relative!r})"
+
+
+def compile_globs(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Compile glob patterns into one regex, or None if there are none."""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def walk_vault(root, include: Iterable[str] = ('*.md',), exclude: Iterable[str] = (),
+               skip_hidden: bool = True, excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS) -> Iterator[VaultEntry]:
+    """Yield files under root whose relative path matches include but not exclude.
+
+    Exclude globs are also tested against directory paths, and a matching
+    directory is pruned along with everything below it. Entries are yielded
+    depth-first with names sorted, so the order is stable across platforms.
+    Symlinked directories are not followed.
+    """
+    root = Path(root)
+    include_re = compile_globs(include)
+    exclude_re = compile_globs(exclude)
+    excluded_dirs = frozenset(excluded_dirs)
+
+    stack = [(root, '')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if skip_hidden and name.startswith('.'):
+                continue
+            relative = prefix + name
+
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if name in excluded_dirs:
+                    continue
+                if exclude_re and exclude_re.match(relative):
+                    continue
+                subdirs.append((Path(entry.path), relative + '/'))
+                continue
+
+            if include_re and not include_re.match(relative) and not include_re.match(name):
+                continue
+            if exclude_re and exclude_re.match(relative):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield VaultEntry(Path(entry.path), relative, stat)
+
+        # Push in reverse so subdirectories are visited in sorted order
+        stack.extend(reversed(subdirs))